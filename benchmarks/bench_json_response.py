@@ -0,0 +1,111 @@
+"""Compare response encoding for GET /api/v1/users?items_per_page=100.
+
+Builds the application twice, with FAST_JSON_RESPONSES off and on, and times
+the same listing against both, in process through httpx's ASGI transport.
+It also times the render step alone on the same payload. Run it from the
+repository root with the database from `.env` reachable:
+
+    python -m benchmarks.bench_json_response --requests 500
+"""
+
+import argparse
+import asyncio
+import statistics
+import time
+import uuid
+
+import httpx
+from fastapi.responses import JSONResponse
+
+from src.app.api import router
+from src.app.core.config import settings
+from src.app.core.db.database import local_session
+from src.app.core.responses import FastJSONResponse
+from src.app.core.setup import create_application
+from src.app.crud.crud_users import create_users_unless_taken
+from src.app.schemas.user import UserCreateInternal
+
+URL = "/api/v1/users?items_per_page=100&include_total=false"
+# Rows are only listed, never logged into, so any bcrypt-shaped string will do.
+PLACEHOLDER_HASH = "$2b$12$" + "x" * 53
+
+
+async def seed_users(count: int) -> None:
+    suffix = uuid.uuid4().hex[:8]
+    users = [
+        UserCreateInternal(
+            name=f"Bench User {i}",
+            username=f"bench{suffix}{i}",
+            email=f"bench{suffix}{i}@example.com",
+            hashed_password=PLACEHOLDER_HASH,
+        )
+        for i in range(count)
+    ]
+    async with local_session() as db:
+        await create_users_unless_taken(db=db, objects=users)
+
+
+async def time_requests(fast_json: bool, requests: int) -> tuple[list[float], bytes]:
+    app = create_application(
+        router=router,
+        settings=settings.model_copy(update={"FAST_JSON_RESPONSES": fast_json}),
+    )
+    transport = httpx.ASGITransport(app=app)
+    timings = []
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as c:
+        body = (await c.get(URL)).content  # warm-up
+        for _ in range(requests):
+            started = time.perf_counter()
+            response = await c.get(URL)
+            timings.append(time.perf_counter() - started)
+            response.raise_for_status()
+    return timings, body
+
+
+def time_render(
+    content: dict, response_class: type[JSONResponse], rounds: int
+) -> float:
+    started = time.perf_counter()
+    for _ in range(rounds):
+        response_class(content)
+    return (time.perf_counter() - started) / rounds
+
+
+def summarize(label: str, timings: list[float]) -> None:
+    quantiles = statistics.quantiles(timings, n=100)
+    print(
+        f"{label:<10} mean {statistics.mean(timings) * 1000:7.2f} ms"
+        f"  p50 {quantiles[49] * 1000:7.2f} ms  p95 {quantiles[94] * 1000:7.2f} ms"
+    )
+
+
+async def main(requests: int, seed: int) -> None:
+    if seed:
+        await seed_users(seed)
+
+    stdlib, stdlib_body = await time_requests(fast_json=False, requests=requests)
+    fast, fast_body = await time_requests(fast_json=True, requests=requests)
+    assert stdlib_body == fast_body, "encoders disagree on the response body"
+
+    print(f"GET {URL} x{requests}")
+    summarize("stdlib", stdlib)
+    summarize("orjson", fast)
+
+    content = httpx.Response(200, content=stdlib_body).json()
+    stdlib_render = time_render(content, JSONResponse, rounds=requests)
+    fast_render = time_render(content, FastJSONResponse, rounds=requests)
+    print(
+        f"render     stdlib {stdlib_render * 1e6:7.1f} us"
+        f"  orjson {fast_render * 1e6:7.1f} us"
+        f"  ({stdlib_render / fast_render:.1f}x)"
+    )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument(
+        "--seed", type=int, default=100, help="users to insert first, 0 to skip"
+    )
+    args = parser.parse_args()
+    asyncio.run(main(args.requests, args.seed))
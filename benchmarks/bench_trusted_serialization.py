@@ -0,0 +1,102 @@
+"""Per-row cost of FastAPI's response_model path vs. the trusted path.
+
+The response_model path is the one FastAPI runs for a handler that returns a
+dict: validate against the model with `serialize_response`, then render. The
+trusted path hands the same dict straight to the response class. No database
+is needed:
+
+    python -m benchmarks.bench_trusted_serialization --rounds 2000
+"""
+
+import argparse
+import asyncio
+import time
+from collections.abc import Callable
+from typing import Any
+
+from fastapi._compat import ModelField
+from fastapi.responses import JSONResponse
+from fastapi.routing import serialize_response
+from fastapi.utils import create_response_field
+
+from src.app.core.pagination import CursorPaginatedListResponse
+from src.app.core.responses import FastJSONResponse
+from src.app.schemas.user import UserRead
+
+
+def user_rows(count: int) -> list[dict]:
+    return [
+        {
+            "id": i,
+            "name": f"User Userson {i}",
+            "username": f"userson{i}",
+            "email": f"user.userson{i}@example.com",
+            "profile_image_url": "https://www.profileimageurl.com",
+        }
+        for i in range(count)
+    ]
+
+
+def page(rows: list[dict]) -> dict:
+    return {
+        "data": rows,
+        "total_count": None,
+        "total_count_exact": None,
+        "has_more": True,
+        "page": None,
+        "items_per_page": len(rows),
+        "next_cursor": "MTAw",
+    }
+
+
+async def validated(
+    field: ModelField, content: dict, response_class: type[JSONResponse]
+) -> None:
+    response_class(await serialize_response(field=field, response_content=content))
+
+
+def trusted(content: dict, response_class: type[JSONResponse]) -> None:
+    response_class(content)
+
+
+async def per_row_us(
+    run: Callable[..., Any], rows: int, rounds: int, *args: Any
+) -> float:
+    started = time.perf_counter()
+    for _ in range(rounds):
+        result = run(*args)
+        if asyncio.iscoroutine(result):
+            await result
+    return (time.perf_counter() - started) / rounds / rows * 1e6
+
+
+async def main(rounds: int) -> None:
+    field = create_response_field(
+        name="Response_read_users",
+        type_=CursorPaginatedListResponse[UserRead],
+        mode="serialization",
+    )
+    print(
+        f"{'rows':>5} {'encoder':<8} {'validated':>12} {'trusted':>12} {'speedup':>8}"
+    )
+    for rows in (1, 10, 100):
+        content = page(user_rows(rows))
+        for name, response_class in (
+            ("stdlib", JSONResponse),
+            ("orjson", FastJSONResponse),
+        ):
+            before = await per_row_us(
+                validated, rows, rounds, field, content, response_class
+            )
+            after = await per_row_us(trusted, rows, rounds, content, response_class)
+            print(
+                f"{rows:>5} {name:<8} {before:>9.2f} us {after:>9.2f} us"
+                f" {before / after:>7.1f}x"
+            )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rounds", type=int, default=1000)
+    args = parser.parse_args()
+    asyncio.run(main(args.rounds))
@@ -0,0 +1,265 @@
+"""Load test for the auth and user endpoints.
+
+Seeds `--users` accounts, then runs `--concurrency` virtual users for
+`--duration` seconds. Each one repeats the session flow login -> /user/me/ ->
+/users (first page, then the next cursor page) -> refresh -> logout. RPS and
+p50/p95/p99 latency per endpoint are written to a JSON file, so runs on
+different commits can be compared.
+
+By default the app is driven in process through httpx's ASGI transport, using
+the database configured in `.env`. Use a throwaway database, because seeded
+users are not removed. Pass `--base-url` to target a running server instead;
+seeding still writes to the configured database, so it must be the one that
+server uses. All virtual users log in from one address, so run the app with
+LOGIN_IP_RATE_PER_MINUTE=0 unless the login rate limits are under test.
+
+    python -m benchmarks.load_test --users 200 --concurrency 20 --duration 30
+"""
+
+import argparse
+import asyncio
+import json
+import platform
+import statistics
+import subprocess
+import time
+import uuid
+from collections import defaultdict
+from datetime import UTC, datetime
+from http.cookies import SimpleCookie
+from typing import Any
+
+import httpx
+from faker import Faker
+
+from src.app.core.config import settings
+from src.app.core.db.database import local_session
+from src.app.core.security import async_get_password_hash
+from src.app.crud.crud_users import create_users_unless_taken
+from src.app.schemas.user import UserCreateInternal
+
+fake = Faker()
+
+PASSWORD = "L0adT3st!pass"
+SEED_BATCH_SIZE = 500
+
+
+class Recorder:
+    def __init__(self) -> None:
+        self.latencies: dict[str, list[float]] = defaultdict(list)
+        self.errors: dict[str, int] = defaultdict(int)
+
+    async def request(
+        self, client: httpx.AsyncClient, name: str, method: str, url: str, **kwargs
+    ) -> httpx.Response | None:
+        started = time.perf_counter()
+        try:
+            response = await client.request(method, url, **kwargs)
+        except httpx.HTTPError:
+            self.errors[name] += 1
+            return None
+        self.latencies[name].append(time.perf_counter() - started)
+        if response.is_error:
+            self.errors[name] += 1
+            return None
+        return response
+
+
+# -------------- seeding --------------
+async def seed_users(count: int) -> list[str]:
+    """Insert `count` users sharing one password, like tests/helpers/generators."""
+    run_id = uuid.uuid4().hex[:6]
+    hashed_password = await async_get_password_hash(PASSWORD)
+    usernames = [f"load{run_id}{i}" for i in range(count)]
+
+    async with local_session() as db:
+        for start in range(0, count, SEED_BATCH_SIZE):
+            batch = [
+                UserCreateInternal(
+                    name=fake.name()[:30],
+                    username=username,
+                    email=f"{username}@example.com",
+                    hashed_password=hashed_password,
+                )
+                for username in usernames[start : start + SEED_BATCH_SIZE]
+            ]
+            await create_users_unless_taken(db=db, objects=batch)
+    return usernames
+
+
+# -------------- scenario --------------
+async def session_flow(
+    client: httpx.AsyncClient, recorder: Recorder, username: str
+) -> None:
+    response = await recorder.request(
+        client,
+        "login",
+        "POST",
+        "/api/v1/login",
+        data={"username": username, "password": PASSWORD},
+    )
+    if response is None:
+        return
+    headers = {"Authorization": f"Bearer {response.json()['access_token']}"}
+    # The refresh cookie is `Secure`, so httpx won't send it back over http.
+    refresh_cookie = SimpleCookie(response.headers.get("set-cookie", ""))
+
+    await recorder.request(
+        client, "user_me", "GET", "/api/v1/user/me/", headers=headers
+    )
+
+    response = await recorder.request(
+        client, "users_page", "GET", "/api/v1/users?items_per_page=20"
+    )
+    if response is not None and response.json().get("next_cursor"):
+        await recorder.request(
+            client,
+            "users_cursor",
+            "GET",
+            "/api/v1/users",
+            params={"items_per_page": 20, "after": response.json()["next_cursor"]},
+        )
+
+    if "refresh_token" in refresh_cookie:
+        await recorder.request(
+            client,
+            "refresh",
+            "POST",
+            "/api/v1/refresh",
+            headers={
+                "Cookie": f"refresh_token={refresh_cookie['refresh_token'].value}"
+            },
+        )
+
+    await recorder.request(client, "logout", "POST", "/api/v1/logout", headers=headers)
+
+
+async def virtual_user(
+    client: httpx.AsyncClient,
+    recorder: Recorder,
+    usernames: list[str],
+    offset: int,
+    deadline: float,
+) -> None:
+    i = offset
+    while time.perf_counter() < deadline:
+        await session_flow(client, recorder, usernames[i % len(usernames)])
+        i += 1
+
+
+async def drive(
+    client: httpx.AsyncClient,
+    recorder: Recorder,
+    usernames: list[str],
+    args: argparse.Namespace,
+) -> float:
+    started = time.perf_counter()
+    deadline = started + args.duration
+    await asyncio.gather(
+        *(
+            virtual_user(client, recorder, usernames, offset, deadline)
+            for offset in range(args.concurrency)
+        )
+    )
+    return time.perf_counter() - started
+
+
+async def run(args: argparse.Namespace) -> dict[str, Any]:
+    recorder = Recorder()
+
+    if args.base_url:
+        usernames = await seed_users(args.users)
+        async with httpx.AsyncClient(base_url=args.base_url, timeout=30) as client:
+            elapsed = await drive(client, recorder, usernames, args)
+        return report(args, recorder, elapsed)
+
+    from src.app.main import app
+
+    # ASGITransport doesn't send lifespan events; run startup and shutdown so
+    # the caches and background tasks behave as in a server.
+    async with app.router.lifespan_context(app):
+        usernames = await seed_users(args.users)
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(
+            transport=transport, base_url="http://loadtest", timeout=30
+        ) as client:
+            elapsed = await drive(client, recorder, usernames, args)
+    return report(args, recorder, elapsed)
+
+
+# -------------- report --------------
+def summarize(latencies: list[float], errors: int, elapsed: float) -> dict[str, Any]:
+    summary: dict[str, Any] = {
+        "requests": len(latencies),
+        "errors": errors,
+        "rps": round(len(latencies) / elapsed, 2),
+    }
+    if len(latencies) >= 2:
+        quantiles = statistics.quantiles(latencies, n=100)
+        summary.update(
+            {
+                "p50_ms": round(quantiles[49] * 1000, 2),
+                "p95_ms": round(quantiles[94] * 1000, 2),
+                "p99_ms": round(quantiles[98] * 1000, 2),
+            }
+        )
+    return summary
+
+
+def git_commit() -> str | None:
+    try:
+        return subprocess.check_output(
+            ["git", "rev-parse", "--short", "HEAD"],
+            text=True,
+            stderr=subprocess.DEVNULL,
+        ).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def report(args: argparse.Namespace, recorder: Recorder, elapsed: float) -> dict:
+    endpoints = sorted(set(recorder.latencies) | set(recorder.errors))
+    all_latencies = [t for name in endpoints for t in recorder.latencies[name]]
+    return {
+        "commit": git_commit(),
+        "started_at": datetime.now(UTC).isoformat(),
+        "python": platform.python_version(),
+        "target": args.base_url or "in-process",
+        "database": settings.DATABASE_BACKEND.value,
+        "users": args.users,
+        "concurrency": args.concurrency,
+        "duration_seconds": round(elapsed, 2),
+        "total": summarize(all_latencies, sum(recorder.errors.values()), elapsed),
+        "endpoints": {
+            name: summarize(recorder.latencies[name], recorder.errors[name], elapsed)
+            for name in endpoints
+        },
+    }
+
+
+def print_report(result: dict) -> None:
+    print(
+        f"{'endpoint':<14}{'requests':>9}{'errors':>8}{'rps':>9}{'p50':>9}{'p95':>9}{'p99':>9}"
+    )
+    rows = list(result["endpoints"].items()) + [("total", result["total"])]
+    for name, s in rows:
+        print(
+            f"{name:<14}{s['requests']:>9}{s['errors']:>8}{s['rps']:>9.1f}"
+            f"{s.get('p50_ms', 0):>9.1f}{s.get('p95_ms', 0):>9.1f}{s.get('p99_ms', 0):>9.1f}"
+        )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--users", type=int, default=100)
+    parser.add_argument("--concurrency", type=int, default=10)
+    parser.add_argument("--duration", type=float, default=15.0)
+    parser.add_argument("--base-url", default=None, help="target a running server")
+    parser.add_argument("--output", default="load_test_results.json")
+    args = parser.parse_args()
+
+    result = asyncio.run(run(args))
+    with open(args.output, "w") as f:
+        json.dump(result, f, indent=2)
+    print_report(result)
+    print(f"\nWritten to {args.output}")
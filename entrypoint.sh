@@ -14,7 +14,9 @@ cd /code/src && PYTHONPATH=/code/src alembic upgrade head
 # Start the application based on service type
 if [ "$SERVICE_TYPE" = "web" ]; then
     echo "Starting the web application..."
-    uvicorn app.main:app --host 0.0.0.0 --port 8000
+    # Workers and pool sizes come from the SERVER_* and WEB_CONCURRENCY settings,
+    # see src/gunicorn.conf.py.
+    exec gunicorn -c gunicorn.conf.py app.main:app
 elif [ "$SERVICE_TYPE" = "streamlit" ]; then
     echo "Starting the Streamlit application..."
     cd /code/src && streamlit run app/streamlit/main.py --server.port 8501 --server.address 0.0.0.0
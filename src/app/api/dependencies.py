@@ -3,33 +3,71 @@ from typing import Annotated, Any
 from fastapi import Depends, HTTPException, Request
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from ..core.db.database import async_get_db
+from ..core.cache import TTLCache
+from ..core.config import settings
+from ..core.db.database import async_get_db, async_get_read_db, release_connection
 from ..core.exceptions.http_exceptions import ForbiddenException, UnauthorizedException
 from ..core.logger import logging
-from ..core.security import oauth2_scheme, verify_token
+from ..core.security import (
+    decode_token,
+    get_user_unless_revoked,
+    oauth2_scheme,
+    revocation_cache,
+    token_digest,
+)
 from ..crud.crud_users import crud_users
+from ..schemas.user import UserReadInternal
 
 logger = logging.getLogger(__name__)
 
+user_cache: TTLCache[dict[str, Any]] = TTLCache(
+    "user", maxsize=settings.USER_CACHE_SIZE, ttl=settings.USER_CACHE_TTL_SECONDS
+)
+
+
+def invalidate_cached_user(user: dict[str, Any]) -> None:
+    """Drop a user row from this worker's cache under both of its lookup keys."""
+    user_cache.pop(user["username"])
+    user_cache.pop(user["email"])
+
 
 async def get_current_user(
     token: Annotated[str, Depends(oauth2_scheme)],
     db: Annotated[AsyncSession, Depends(async_get_db)],
+    read_db: Annotated[AsyncSession, Depends(async_get_read_db)],
 ) -> dict[str, Any] | None:
-    token_data = await verify_token(token, db)
-    if token_data is None:
+    payload = decode_token(token)
+    username_or_email: str | None = payload.get("sub") if payload else None
+    if username_or_email is None:
         raise UnauthorizedException("User not authenticated.")
 
-    if "@" in token_data.username_or_email:
-        user: dict | None = await crud_users.get(
-            db=db, email=token_data.username_or_email, is_deleted=False
+    digest = token_digest(token, payload)
+    if not revocation_cache.loaded:
+        # A lagging replica could miss a just-revoked token, so the revocation
+        # check always runs on the primary.
+        user = await get_user_unless_revoked(
+            username_or_email, digest, db, schema_to_select=UserReadInternal
         )
+    elif digest in revocation_cache:
+        user = None
     else:
+        user = user_cache.get(username_or_email)
+        if user is not None:
+            return user
+
+        lookup = "email" if "@" in username_or_email else "username"
         user = await crud_users.get(
-            db=db, username=token_data.username_or_email, is_deleted=False
+            db=read_db,
+            schema_to_select=UserReadInternal,
+            is_deleted=False,
+            **{lookup: username_or_email},
         )
 
+    await release_connection(db)
+    if read_db is not db:
+        await release_connection(read_db)
     if user:
+        user_cache.set(username_or_email, user)
         return user
 
     raise UnauthorizedException("User not authenticated.")
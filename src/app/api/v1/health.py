@@ -0,0 +1,17 @@
+from fastapi import APIRouter, Depends, Request
+
+from ...api.dependencies import get_current_superuser
+from ...core.db.database import pool_status
+from ...core.schemas import DatabasePoolStatus
+
+router = APIRouter(tags=["health"])
+
+
+@router.get(
+    "/health/db-pool",
+    response_model=DatabasePoolStatus,
+    dependencies=[Depends(get_current_superuser)],
+)
+async def read_db_pool_status(request: Request) -> dict:
+    """Connection pool usage of the worker that serves the request."""
+    return pool_status()
@@ -1,3 +1,4 @@
+import math
 from datetime import timedelta
 from typing import Annotated
 
@@ -5,9 +6,13 @@ from fastapi import APIRouter, Depends, Request, Response
 from fastapi.security import OAuth2PasswordRequestForm
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from ...core.admission import AdmissionController, RateLimiter
 from ...core.config import settings
-from ...core.db.database import async_get_db
-from ...core.exceptions.http_exceptions import UnauthorizedException
+from ...core.db.database import async_get_db, release_connection
+from ...core.exceptions.http_exceptions import (
+    TooManyRequestsException,
+    UnauthorizedException,
+)
 from ...core.schemas import Token
 from ...core.security import (
     ACCESS_TOKEN_EXPIRE_MINUTES,
@@ -19,16 +24,54 @@ from ...core.security import (
 
 router = APIRouter(tags=["login"])
 
+# Every login costs a bcrypt verification, so bursts are limited and shed here
+# before they can take all the CPU from the other endpoints.
+login_admission = AdmissionController(
+    "login",
+    max_concurrency=settings.LOGIN_MAX_CONCURRENCY,
+    queue_size=settings.LOGIN_QUEUE_SIZE,
+    queue_timeout=settings.LOGIN_QUEUE_TIMEOUT_SECONDS,
+    retry_after=settings.LOGIN_RETRY_AFTER_SECONDS,
+)
+login_ip_limiter = RateLimiter(
+    "login_ip",
+    rate=settings.LOGIN_IP_RATE_PER_MINUTE / 60,
+    burst=settings.LOGIN_IP_BURST,
+    max_keys=settings.LOGIN_RATE_LIMIT_KEYS,
+)
+login_username_limiter = RateLimiter(
+    "login_username",
+    rate=settings.LOGIN_USERNAME_RATE_PER_MINUTE / 60,
+    burst=settings.LOGIN_USERNAME_BURST,
+    max_keys=settings.LOGIN_RATE_LIMIT_KEYS,
+)
+
+
+def limit_login_rate(request: Request, username_or_email: str) -> None:
+    client_ip = request.client.host if request.client else None
+    retry_after = max(
+        login_ip_limiter.acquire(client_ip),
+        login_username_limiter.acquire(username_or_email.lower()),
+    )
+    if retry_after:
+        raise TooManyRequestsException(
+            "Too many login attempts, try again later.",
+            retry_after=math.ceil(retry_after),
+        )
+
 
 @router.post("/login", response_model=Token, status_code=201)
 async def login_for_access_token(
+    request: Request,
     response: Response,
     form_data: Annotated[OAuth2PasswordRequestForm, Depends()],
     db: Annotated[AsyncSession, Depends(async_get_db)],
 ) -> dict[str, str]:
-    user = await authenticate_user(
-        username_or_email=form_data.username, password=form_data.password, db=db
-    )
+    limit_login_rate(request, form_data.username)
+    async with login_admission.admit():
+        user = await authenticate_user(
+            username_or_email=form_data.username, password=form_data.password, db=db
+        )
     if not user:
         raise UnauthorizedException("Wrong username, email or password.")
 
@@ -61,6 +104,7 @@ async def refresh_access_token(
         raise UnauthorizedException("Refresh token missing.")
 
     user_data = await verify_token(refresh_token, db)
+    await release_connection(db)
     if not user_data:
         raise UnauthorizedException("Invalid refresh token.")
 
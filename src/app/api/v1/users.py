@@ -1,74 +1,332 @@
+import asyncio
+import csv
+import io
+import itertools
+import json
+from collections.abc import Iterable, Iterator
 from typing import Annotated, Any
 
-from fastapi import APIRouter, Depends, Request
-from fastcrud.paginated import PaginatedListResponse, compute_offset, paginated_response
+from fastapi import APIRouter, Depends, Query, Request, Response, UploadFile
+from fastcrud.paginated import compute_offset
+from pydantic import ValidationError
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
+from starlette.concurrency import iterate_in_threadpool
 
-from ...api.dependencies import get_current_superuser, get_current_user
-from ...core.db.database import async_get_db
+from ...api.dependencies import (
+    get_current_superuser,
+    get_current_user,
+    invalidate_cached_user,
+)
+from ...core.cache import TTLCache
+from ...core.config import CountStrategyOption, settings
+from ...core.db.database import async_get_db, async_get_read_db, release_connection
 from ...core.exceptions.http_exceptions import (
     DuplicateValueException,
     ForbiddenException,
     NotFoundException,
 )
 from ...core.logger import logging
-from ...core.security import blacklist_token, get_password_hash, oauth2_scheme
-from ...crud.crud_users import crud_users
-from ...schemas.user import UserCreate, UserCreateInternal, UserRead, UserUpdate
+from ...core.pagination import (
+    MAX_ITEMS_PER_PAGE,
+    CursorPaginatedListResponse,
+    cursor_paginated_response,
+    decode_cursor,
+    estimated_row_count,
+)
+from ...core.responses import trusted_response
+from ...core.security import async_get_password_hash, blacklist_token, oauth2_scheme
+from ...crud.crud_users import (
+    create_user_unless_taken,
+    create_users_unless_taken,
+    crud_users,
+    get_taken_fields,
+    taken_field,
+    update_user_returning,
+)
+from ...models.user import User
+from ...schemas.user import (
+    UserCreate,
+    UserCreateInternal,
+    UserImportError,
+    UserImportReport,
+    UserRead,
+    UserUpdate,
+)
 
 logger = logging.getLogger(__name__)
 
 router = APIRouter(tags=["users"])
 
+user_count_cache: TTLCache[int] = TTLCache(
+    "user_count", maxsize=1, ttl=settings.USER_COUNT_CACHE_TTL_SECONDS
+)
+
+
+async def count_users(
+    db: AsyncSession, strategy: CountStrategyOption
+) -> tuple[int, bool]:
+    """Count non-deleted users, returning the count and whether it is exact.
+
+    Estimates below USER_COUNT_ESTIMATE_THRESHOLD fall back to an exact count,
+    since small tables are cheap to count and their estimates are the noisiest.
+    """
+    if strategy == CountStrategyOption.ESTIMATED:
+        estimate = await estimated_row_count(db, User.__tablename__)
+        if estimate is not None and estimate >= settings.USER_COUNT_ESTIMATE_THRESHOLD:
+            return estimate, False
+
+    if strategy == CountStrategyOption.CACHED:
+        cached = user_count_cache.get("total")
+        if cached is not None:
+            return cached, False
+
+    total_count: int = await crud_users.count(db=db, is_deleted=False)
+    user_count_cache.set("total", total_count)
+    return total_count, True
+
 
 @router.post("/user", response_model=UserRead, status_code=201)
 async def write_user(
     request: Request,
     user: UserCreate,
     db: Annotated[AsyncSession, Depends(async_get_db)],
-) -> UserRead:
-    logger.info(f"Creating user with email: {user.email} and username: {user.username}")
-    email_row = await crud_users.exists(db=db, email=user.email)
-    if email_row:
-        logger.error(f"Email {user.email} is already registered")
-        raise DuplicateValueException("Email is already registered")
-
-    username_row = await crud_users.exists(db=db, username=user.username)
-    if username_row:
-        logger.error(f"Username {user.username} is already registered")
-        raise DuplicateValueException("Username not available")
-
+) -> dict[str, Any]:
+    logger.info(
+        "Creating user with email: %s and username: %s", user.email, user.username
+    )
     user_internal_dict = user.model_dump()
-    user_internal_dict["hashed_password"] = get_password_hash(
+    user_internal_dict["hashed_password"] = await async_get_password_hash(
         password=user_internal_dict["password"]
     )
     del user_internal_dict["password"]
 
     user_internal = UserCreateInternal(**user_internal_dict)
-    created_user: UserRead = await crud_users.create(db=db, object=user_internal)
-    logger.info(f"User {created_user.username} created successfully")
+    created_user = await create_user_unless_taken(
+        db=db, object=user_internal, schema_to_select=UserRead
+    )
+    if created_user is None:
+        taken = await get_taken_fields(db=db, email=user.email, username=user.username)
+        if "email" in taken:
+            logger.error("Email %s is already registered", user.email)
+            raise DuplicateValueException("Email is already registered")
+
+        logger.error("Username %s is already registered", user.username)
+        raise DuplicateValueException("Username not available")
+
+    user_count_cache.clear()
+    logger.info("User %s created successfully", created_user["username"])
     return created_user
 
 
-@router.get("/users", response_model=PaginatedListResponse[UserRead])
-async def read_users(
+def read_import_rows(
+    file: UploadFile, chunk_size: int
+) -> Iterator[list[tuple[int, dict | None]]]:
+    """Yield chunks of `(row_number, row)` from a CSV or NDJSON upload, with
+    `row` None for lines that are not valid JSON."""
+    text_file = io.TextIOWrapper(file.file, encoding="utf-8")
+    is_csv = file.content_type == "text/csv" or (file.filename or "").endswith(".csv")
+    if is_csv:
+        rows: Iterator[tuple[int, dict | None]] = enumerate(
+            csv.DictReader(text_file), start=1
+        )
+    else:
+        rows = parse_ndjson(text_file)
+
+    while chunk := list(itertools.islice(rows, chunk_size)):
+        yield chunk
+
+
+def parse_ndjson(lines: Iterable[str]) -> Iterator[tuple[int, dict | None]]:
+    for row_number, line in enumerate(lines, start=1):
+        if not line.strip():
+            continue
+        try:
+            yield row_number, json.loads(line)
+        except json.JSONDecodeError:
+            yield row_number, None
+
+
+def validation_detail(error: ValidationError) -> str:
+    """The failed fields and messages, without the submitted values."""
+    return "; ".join(
+        f"{'.'.join(str(loc) for loc in e['loc'])}: {e['msg']}"
+        for e in error.errors(include_url=False, include_input=False)
+    )
+
+
+# Imports share the password worker pool with logins; this caps how many of
+# its workers they may keep busy, across all running imports.
+import_hash_slots = asyncio.Semaphore(settings.USER_IMPORT_HASH_CONCURRENCY)
+
+
+async def hash_import_password(password: str) -> str:
+    async with import_hash_slots:
+        return await async_get_password_hash(password)
+
+
+def dedupe_batch(
+    batch: list[tuple[int, UserCreate]], errors: list[UserImportError]
+) -> list[tuple[int, UserCreate]]:
+    """Drop rows repeating an earlier row's username or email, so that rows
+    skipped by the INSERT can only conflict with existing users."""
+    usernames: set[str] = set()
+    emails: set[str] = set()
+    unique = []
+    for row_number, user in batch:
+        if user.username in usernames or user.email in emails:
+            errors.append(
+                UserImportError(
+                    row=row_number, detail="Email or username repeats an earlier row"
+                )
+            )
+            continue
+        usernames.add(user.username)
+        emails.add(user.email)
+        unique.append((row_number, user))
+    return unique
+
+
+async def import_user_batch(
+    db: AsyncSession, batch: list[tuple[int, UserCreate]], errors: list[UserImportError]
+) -> int:
+    batch = dedupe_batch(batch, errors)
+    hashed_passwords = await asyncio.gather(
+        *(hash_import_password(user.password) for _, user in batch)
+    )
+    users_internal = [
+        UserCreateInternal(
+            **user.model_dump(exclude={"password"}), hashed_password=hashed_password
+        )
+        for (_, user), hashed_password in zip(batch, hashed_passwords)
+    ]
+    created = await create_users_unless_taken(db=db, objects=users_internal)
+
+    imported = 0
+    for row_number, user in batch:
+        if user.username in created:
+            imported += 1
+        else:
+            errors.append(
+                UserImportError(
+                    row=row_number, detail="Email or username already registered"
+                )
+            )
+    return imported
+
+
+@router.post(
+    "/users/import",
+    response_model=UserImportReport,
+    status_code=201,
+    dependencies=[Depends(get_current_superuser)],
+)
+async def import_users(
     request: Request,
+    file: UploadFile,
     db: Annotated[AsyncSession, Depends(async_get_db)],
-    page: int = 1,
-    items_per_page: int = 10,
-) -> dict:
+) -> dict[str, Any]:
+    """Bulk-create users from a CSV or NDJSON file of `UserCreate` rows.
+
+    Rows are validated and inserted in batches of USER_IMPORT_BATCH_SIZE, with
+    passwords hashed on at most USER_IMPORT_HASH_CONCURRENCY password workers.
+    Invalid or duplicate rows are reported by row number and skipped.
+    """
+    errors: list[UserImportError] = []
+    imported = 0
+    batch: list[tuple[int, UserCreate]] = []
+
+    rows = read_import_rows(file, chunk_size=settings.USER_IMPORT_BATCH_SIZE)
+    async for chunk in iterate_in_threadpool(rows):
+        for row_number, row in chunk:
+            if row is None:
+                errors.append(UserImportError(row=row_number, detail="Invalid JSON"))
+                continue
+            if not isinstance(row, dict):
+                errors.append(
+                    UserImportError(row=row_number, detail="Row is not an object")
+                )
+                continue
+            if None in row:  # csv.DictReader collects surplus fields under None
+                errors.append(
+                    UserImportError(
+                        row=row_number, detail="Row has more fields than the header"
+                    )
+                )
+                continue
+            try:
+                batch.append((row_number, UserCreate(**row)))
+            except ValidationError as e:
+                errors.append(
+                    UserImportError(row=row_number, detail=validation_detail(e))
+                )
+                continue
+
+            if len(batch) >= settings.USER_IMPORT_BATCH_SIZE:
+                imported += await import_user_batch(db, batch, errors)
+                batch = []
+
+    if batch:
+        imported += await import_user_batch(db, batch, errors)
+
+    user_count_cache.clear()
+    logger.info("Imported %d users, %d rows failed", imported, len(errors))
+    return {
+        "imported": imported,
+        "failed": len(errors),
+        "errors": sorted(errors, key=lambda error: error.row),
+    }
+
+
+@router.get("/users", response_model=CursorPaginatedListResponse[UserRead])
+async def read_users(
+    request: Request,
+    db: Annotated[AsyncSession, Depends(async_get_read_db)],
+    page: Annotated[int, Query(ge=1)] = 1,
+    items_per_page: Annotated[int, Query(ge=1, le=MAX_ITEMS_PER_PAGE)] = 10,
+    after: str | None = None,
+    include_total: bool | None = None,
+    count: CountStrategyOption = settings.USER_COUNT_STRATEGY,
+) -> Response:
+    """List users by page number, or by keyset when an `after` cursor is given.
+
+    Keyset pages seek on the primary key, so they cost the same at any depth.
+    The total count is included by default for page numbers and omitted by
+    default for cursors; `count` picks how it is obtained and
+    `total_count_exact` in the response tells whether it is exact.
+    """
+    filters: dict[str, Any] = {"is_deleted": False}
+    if after is None:
+        offset = compute_offset(page, items_per_page)
+    else:
+        offset = 0
+        filters["id__gt"] = decode_cursor(after)
+
     users_data = await crud_users.get_multi(
         db=db,
-        offset=compute_offset(page, items_per_page),
-        limit=items_per_page,
+        offset=offset,
+        limit=items_per_page + 1,
         schema_to_select=UserRead,
-        is_deleted=False,
+        sort_columns="id",
+        return_total_count=False,
+        **filters,
     )
 
-    response: dict[str, Any] = paginated_response(
-        crud_data=users_data, page=page, items_per_page=items_per_page
+    total_count, total_count_exact = None, None
+    if include_total is None:
+        include_total = after is None
+    if include_total:
+        total_count, total_count_exact = await count_users(db, strategy=count)
+    await release_connection(db)
+
+    response: dict[str, Any] = cursor_paginated_response(
+        crud_data=users_data,
+        items_per_page=items_per_page,
+        page=page if after is None else None,
+        total_count=total_count,
+        total_count_exact=total_count_exact,
     )
-    return response
+    return trusted_response(request, response)
 
 
 @router.get("/user/me/", response_model=UserRead)
@@ -80,44 +338,54 @@ async def read_users_me(
 
 @router.get("/user/{username}", response_model=UserRead)
 async def read_user(
-    request: Request, username: str, db: Annotated[AsyncSession, Depends(async_get_db)]
-) -> dict:
+    request: Request,
+    username: str,
+    db: Annotated[AsyncSession, Depends(async_get_read_db)],
+) -> Response:
     db_user: UserRead | None = await crud_users.get(
         db=db, schema_to_select=UserRead, username=username, is_deleted=False
     )
+    await release_connection(db)
     if db_user is None:
         raise NotFoundException("User not found")
 
-    return db_user
+    return trusted_response(request, db_user)
 
 
-@router.patch("/user/{username}")
+@router.patch("/user/{username}", response_model=UserRead)
 async def patch_user(
     request: Request,
     values: UserUpdate,
     username: str,
     current_user: Annotated[UserRead, Depends(get_current_user)],
     db: Annotated[AsyncSession, Depends(async_get_db)],
-) -> dict[str, str]:
-    db_user = await crud_users.get(db=db, schema_to_select=UserRead, username=username)
-    if db_user is None:
-        raise NotFoundException("User not found")
-
-    if db_user["username"] != current_user["username"]:
+) -> dict[str, Any]:
+    if username != current_user["username"]:
+        if not await crud_users.exists(db=db, username=username):
+            raise NotFoundException("User not found")
         raise ForbiddenException()
 
-    if values.username != db_user["username"]:
-        existing_username = await crud_users.exists(db=db, username=values.username)
-        if existing_username:
+    try:
+        db_user = await update_user_returning(
+            db=db,
+            user_id=current_user["id"],
+            username=username,
+            object=values,
+            schema_to_select=UserRead,
+        )
+    except IntegrityError as e:
+        field = taken_field(e)
+        if field == "email":
+            raise DuplicateValueException("Email is already registered")
+        if field == "username":
             raise DuplicateValueException("Username not available")
+        raise
 
-    if values.email != db_user["email"]:
-        existing_email = await crud_users.exists(db=db, email=values.email)
-        if existing_email:
-            raise DuplicateValueException("Email is already registered")
+    if db_user is None:
+        raise NotFoundException("User not found")
 
-    await crud_users.update(db=db, object=values, username=username)
-    return {"message": "User updated"}
+    invalidate_cached_user(current_user)
+    return db_user
 
 
 @router.delete("/user/{username}")
@@ -136,6 +404,8 @@ async def erase_user(
         raise ForbiddenException()
 
     await crud_users.delete(db=db, username=username)
+    invalidate_cached_user(db_user)
+    user_count_cache.clear()
     await blacklist_token(token=token, db=db)
     return {"message": "User deleted"}
 
@@ -147,10 +417,12 @@ async def erase_db_user(
     db: Annotated[AsyncSession, Depends(async_get_db)],
     token: str = Depends(oauth2_scheme),
 ) -> dict[str, str]:
-    db_user = await crud_users.exists(db=db, username=username)
+    db_user = await crud_users.get(db=db, schema_to_select=UserRead, username=username)
     if not db_user:
         raise NotFoundException("User not found")
 
     await crud_users.db_delete(db=db, username=username)
+    invalidate_cached_user(db_user)
+    user_count_cache.clear()
     await blacklist_token(token=token, db=db)
     return {"message": "User deleted from the database"}
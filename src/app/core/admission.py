@@ -0,0 +1,132 @@
+import asyncio
+import time
+from collections import OrderedDict
+from collections.abc import AsyncIterator, Hashable
+from contextlib import asynccontextmanager
+
+from .exceptions.http_exceptions import ServiceUnavailableException
+from .metrics import Counter, Gauge
+
+ADMISSIONS = Counter(
+    "admission_requests_total",
+    "Requests seen by an admission controller or rate limiter, by outcome.",
+    labelnames=("controller", "outcome"),
+)
+ADMISSION_QUEUE_DEPTH = Gauge(
+    "admission_queue_depth",
+    "Requests waiting for an admission slot.",
+    labelnames=("controller",),
+)
+
+
+class AdmissionController:
+    """Caps how many requests run a section at once.
+
+    Up to `max_concurrency` requests are admitted straight away; the next
+    `queue_size` wait for a free slot for at most `queue_timeout` seconds.
+    Everything else is shed with a 503 and `Retry-After`, so a burst costs a
+    bounded amount of work instead of a growing backlog. A `max_concurrency`
+    of 0 disables the controller.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        max_concurrency: int,
+        queue_size: int,
+        queue_timeout: float,
+        retry_after: int,
+    ) -> None:
+        self.name = name
+        self.max_concurrency = max_concurrency
+        self.queue_size = queue_size
+        self.queue_timeout = queue_timeout
+        self.retry_after = retry_after
+        self._semaphore = asyncio.Semaphore(max(1, max_concurrency))
+        self._waiting = 0
+
+    def _shed(self) -> ServiceUnavailableException:
+        ADMISSIONS.inc(controller=self.name, outcome="shed")
+        return ServiceUnavailableException(
+            "Server busy, try again later.", retry_after=self.retry_after
+        )
+
+    async def _wait_for_slot(self) -> None:
+        if self._waiting >= self.queue_size:
+            raise self._shed()
+
+        ADMISSIONS.inc(controller=self.name, outcome="queued")
+        self._waiting += 1
+        ADMISSION_QUEUE_DEPTH.set(self._waiting, controller=self.name)
+        try:
+            async with asyncio.timeout(self.queue_timeout):
+                await self._semaphore.acquire()
+        except TimeoutError:
+            raise self._shed()
+        finally:
+            self._waiting -= 1
+            ADMISSION_QUEUE_DEPTH.set(self._waiting, controller=self.name)
+
+    @asynccontextmanager
+    async def admit(self) -> AsyncIterator[None]:
+        if self.max_concurrency <= 0:
+            yield
+            return
+
+        if self._semaphore.locked() or self._waiting:
+            await self._wait_for_slot()
+        else:
+            await self._semaphore.acquire()
+
+        ADMISSIONS.inc(controller=self.name, outcome="admitted")
+        try:
+            yield
+        finally:
+            self._semaphore.release()
+
+
+class RateLimiter:
+    """Per-key token buckets holding up to `burst` tokens, refilled at `rate`
+    tokens per second.
+
+    Only the `max_keys` most recently seen keys are tracked, which bounds
+    memory when an attacker rotates keys. A `rate` or `burst` of 0 disables
+    the limiter. Buckets are per process, like the other in-process caches.
+    """
+
+    def __init__(self, name: str, rate: float, burst: int, max_keys: int) -> None:
+        self.name = name
+        self.rate = rate
+        self.burst = burst
+        self.max_keys = max_keys
+        self._buckets: OrderedDict[Hashable, tuple[float, float]] = OrderedDict()
+
+    @property
+    def enabled(self) -> bool:
+        return self.rate > 0 and self.burst > 0
+
+    def acquire(self, key: Hashable) -> float:
+        """Take a token for `key`; returns 0 when one was available, otherwise
+        the seconds until the next one is."""
+        if not self.enabled:
+            return 0.0
+
+        now = time.monotonic()
+        tokens, updated_at = self._buckets.pop(key, (float(self.burst), now))
+        tokens = min(float(self.burst), tokens + (now - updated_at) * self.rate)
+        if tokens >= 1:
+            tokens -= 1
+            wait = 0.0
+        else:
+            wait = (1 - tokens) / self.rate
+
+        self._buckets[key] = (tokens, now)
+        if len(self._buckets) > self.max_keys:
+            self._buckets.popitem(last=False)
+
+        if wait:
+            ADMISSIONS.inc(controller=self.name, outcome="rate_limited")
+        return wait
+
+    def clear(self) -> None:
+        self._buckets.clear()
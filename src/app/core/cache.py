@@ -0,0 +1,74 @@
+import time
+from collections import OrderedDict
+from collections.abc import Hashable
+from typing import Generic, TypeVar
+
+from .metrics import Counter, Gauge
+
+V = TypeVar("V")
+
+CACHE_HITS = Counter(
+    "cache_hits_total", "In-process cache hits.", labelnames=("cache",)
+)
+CACHE_MISSES = Counter(
+    "cache_misses_total", "In-process cache misses.", labelnames=("cache",)
+)
+CACHE_SIZE = Gauge(
+    "cache_size", "Entries held per in-process cache.", labelnames=("cache",)
+)
+
+
+class TTLCache(Generic[V]):
+    """Per-process LRU cache whose entries also expire after `ttl` seconds.
+
+    A `maxsize` or `ttl` of 0 disables the cache. Entries are not shared between
+    workers, so writers must invalidate locally and accept that other workers
+    may serve a stale entry for up to `ttl` seconds.
+    """
+
+    def __init__(self, name: str, maxsize: int, ttl: float) -> None:
+        self.name = name
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data: OrderedDict[Hashable, tuple[float, V]] = OrderedDict()
+
+    @property
+    def enabled(self) -> bool:
+        return self.maxsize > 0 and self.ttl > 0
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def get(self, key: Hashable) -> V | None:
+        entry = self._data.get(key)
+        if entry is None:
+            CACHE_MISSES.inc(cache=self.name)
+            return None
+
+        expires_at, value = entry
+        if expires_at <= time.monotonic():
+            self.pop(key)
+            CACHE_MISSES.inc(cache=self.name)
+            return None
+
+        self._data.move_to_end(key)
+        CACHE_HITS.inc(cache=self.name)
+        return value
+
+    def set(self, key: Hashable, value: V) -> None:
+        if not self.enabled:
+            return
+
+        self._data[key] = (time.monotonic() + self.ttl, value)
+        self._data.move_to_end(key)
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+        CACHE_SIZE.set(len(self._data), cache=self.name)
+
+    def pop(self, key: Hashable) -> None:
+        self._data.pop(key, None)
+        CACHE_SIZE.set(len(self._data), cache=self.name)
+
+    def clear(self) -> None:
+        self._data.clear()
+        CACHE_SIZE.set(0, cache=self.name)
@@ -1,7 +1,9 @@
 import os
 from enum import Enum
 from functools import lru_cache
+from typing import Literal
 
+from pydantic import field_validator
 from pydantic_settings import BaseSettings
 from starlette.config import Config
 
@@ -22,6 +24,8 @@ class AppSettings(BaseSettings):
     LICENSE_NAME: str | None = config("LICENSE_NAME", default=None)
     CONTACT_NAME: str | None = config("CONTACT_NAME", default=None)
     CONTACT_EMAIL: str | None = config("CONTACT_EMAIL", default=None)
+    FAST_JSON_RESPONSES: bool = config("FAST_JSON_RESPONSES", cast=bool, default=False)
+    FAST_BOOT: bool = config("FAST_BOOT", cast=bool, default=False)
 
     # Streamlit-specific settings
     STREAMLIT_SERVER_PORT: int = config("STREAMLIT_SERVER_PORT", default=8501)
@@ -35,10 +39,66 @@ class CryptSettings(BaseSettings):
     ALGORITHM: str = config("ALGORITHM", default="HS256")
     ACCESS_TOKEN_EXPIRE_MINUTES: int = config("ACCESS_TOKEN_EXPIRE_MINUTES", default=30)
     REFRESH_TOKEN_EXPIRE_DAYS: int = config("REFRESH_TOKEN_EXPIRE_DAYS", default=7)
+    PASSWORD_HASH_WORKERS: int = config("PASSWORD_HASH_WORKERS", default=4)
+    PASSWORD_HASH_EXECUTOR: Literal["thread", "process"] = config(
+        "PASSWORD_HASH_EXECUTOR", default="thread"
+    )
+    TOKEN_BLACKLIST_CACHE_ENABLED: bool = config(
+        "TOKEN_BLACKLIST_CACHE_ENABLED", cast=bool, default=True
+    )
+    TOKEN_BLACKLIST_POLL_SECONDS: float = config(
+        "TOKEN_BLACKLIST_POLL_SECONDS", cast=float, default=1.0
+    )
+    TOKEN_BLACKLIST_SWEEP_SECONDS: float = config(
+        "TOKEN_BLACKLIST_SWEEP_SECONDS", cast=float, default=300.0
+    )
+    TOKEN_BLACKLIST_SWEEP_BATCH_SIZE: int = config(
+        "TOKEN_BLACKLIST_SWEEP_BATCH_SIZE", cast=int, default=1000
+    )
+    TOKEN_BLACKLIST_PARTITIONED: bool = config(
+        "TOKEN_BLACKLIST_PARTITIONED", cast=bool, default=False
+    )
+
+
+class LoginAdmissionSettings(BaseSettings):
+    LOGIN_MAX_CONCURRENCY: int = config("LOGIN_MAX_CONCURRENCY", cast=int, default=8)
+    LOGIN_QUEUE_SIZE: int = config("LOGIN_QUEUE_SIZE", cast=int, default=64)
+    LOGIN_QUEUE_TIMEOUT_SECONDS: float = config(
+        "LOGIN_QUEUE_TIMEOUT_SECONDS", cast=float, default=2.0
+    )
+    LOGIN_RETRY_AFTER_SECONDS: int = config(
+        "LOGIN_RETRY_AFTER_SECONDS", cast=int, default=2
+    )
+    LOGIN_IP_RATE_PER_MINUTE: float = config(
+        "LOGIN_IP_RATE_PER_MINUTE", cast=float, default=60.0
+    )
+    LOGIN_IP_BURST: int = config("LOGIN_IP_BURST", cast=int, default=20)
+    LOGIN_USERNAME_RATE_PER_MINUTE: float = config(
+        "LOGIN_USERNAME_RATE_PER_MINUTE", cast=float, default=10.0
+    )
+    LOGIN_USERNAME_BURST: int = config("LOGIN_USERNAME_BURST", cast=int, default=5)
+    LOGIN_RATE_LIMIT_KEYS: int = config(
+        "LOGIN_RATE_LIMIT_KEYS", cast=int, default=100000
+    )
+
+
+class DatabaseBackendOption(str, Enum):
+    POSTGRES = "postgres"
+    SQLITE = "sqlite"
 
 
 class DatabaseSettings(BaseSettings):
-    pass
+    DATABASE_BACKEND: DatabaseBackendOption = config(
+        "DATABASE_BACKEND", default="postgres"
+    )
+
+
+class SQLiteSettings(BaseSettings):
+    SQLITE_URI: str = config("SQLITE_URI", default="./sql_app.db")
+    SQLITE_SYNC_PREFIX: str = config("SQLITE_SYNC_PREFIX", default="sqlite:///")
+    SQLITE_ASYNC_PREFIX: str = config(
+        "SQLITE_ASYNC_PREFIX", default="sqlite+aiosqlite:///"
+    )
 
 
 class PostgresSettings(BaseSettings):
@@ -57,6 +117,94 @@ class PostgresSettings(BaseSettings):
         f"{POSTGRES_USER}:{POSTGRES_PASSWORD}@{POSTGRES_SERVER}:{POSTGRES_PORT}/{POSTGRES_DB}"
     )
     POSTGRES_URL: str | None = config("POSTGRES_URL", default=None)
+    POSTGRES_POOL_SIZE: int = config("POSTGRES_POOL_SIZE", cast=int, default=5)
+    POSTGRES_MAX_OVERFLOW: int = config("POSTGRES_MAX_OVERFLOW", cast=int, default=10)
+    POSTGRES_MAX_CONNECTIONS: int | None = config(
+        "POSTGRES_MAX_CONNECTIONS", cast=int, default=None
+    )
+    POSTGRES_POOL_TIMEOUT: float = config(
+        "POSTGRES_POOL_TIMEOUT", cast=float, default=30.0
+    )
+    POSTGRES_POOL_RECYCLE: int = config("POSTGRES_POOL_RECYCLE", cast=int, default=-1)
+    POSTGRES_POOL_PRE_PING: bool = config(
+        "POSTGRES_POOL_PRE_PING", cast=bool, default=False
+    )
+    POSTGRES_STATEMENT_CACHE_SIZE: int = config(
+        "POSTGRES_STATEMENT_CACHE_SIZE", cast=int, default=100
+    )
+    POSTGRES_SCHEMA: str | None = config("POSTGRES_SCHEMA", default=None)
+    POSTGRES_REPLICA_URI: str | None = config("POSTGRES_REPLICA_URI", default=None)
+    POSTGRES_REPLICA_MAX_LAG_SECONDS: float = config(
+        "POSTGRES_REPLICA_MAX_LAG_SECONDS", cast=float, default=5.0
+    )
+    POSTGRES_REPLICA_CHECK_SECONDS: float = config(
+        "POSTGRES_REPLICA_CHECK_SECONDS", cast=float, default=5.0
+    )
+
+
+class UserImportSettings(BaseSettings):
+    USER_IMPORT_BATCH_SIZE: int = config(
+        "USER_IMPORT_BATCH_SIZE", cast=int, default=500
+    )
+    USER_IMPORT_HASH_CONCURRENCY: int = config(
+        "USER_IMPORT_HASH_CONCURRENCY", cast=int, default=2
+    )
+
+
+class CountStrategyOption(str, Enum):
+    EXACT = "exact"
+    CACHED = "cached"
+    ESTIMATED = "estimated"
+
+
+class CacheSettings(BaseSettings):
+    USER_CACHE_SIZE: int = config("USER_CACHE_SIZE", cast=int, default=10000)
+    USER_CACHE_TTL_SECONDS: float = config(
+        "USER_CACHE_TTL_SECONDS", cast=float, default=30.0
+    )
+    USER_COUNT_STRATEGY: CountStrategyOption = config(
+        "USER_COUNT_STRATEGY", default="exact"
+    )
+    USER_COUNT_CACHE_TTL_SECONDS: float = config(
+        "USER_COUNT_CACHE_TTL_SECONDS", cast=float, default=60.0
+    )
+    USER_COUNT_ESTIMATE_THRESHOLD: int = config(
+        "USER_COUNT_ESTIMATE_THRESHOLD", cast=int, default=100000
+    )
+
+
+class MetricsSettings(BaseSettings):
+    METRICS_ENABLED: bool = config("METRICS_ENABLED", cast=bool, default=True)
+
+
+class ServerSettings(BaseSettings):
+    SERVER_HOST: str = config("SERVER_HOST", default="0.0.0.0")
+    SERVER_PORT: int = config("SERVER_PORT", cast=int, default=8000)
+    WEB_CONCURRENCY: int = config(
+        "WEB_CONCURRENCY", cast=int, default=os.cpu_count() or 1
+    )
+    SERVER_PRELOAD: bool = config("SERVER_PRELOAD", cast=bool, default=True)
+    SERVER_TIMEOUT: int = config("SERVER_TIMEOUT", cast=int, default=60)
+    SERVER_GRACEFUL_TIMEOUT: int = config(
+        "SERVER_GRACEFUL_TIMEOUT", cast=int, default=30
+    )
+    SERVER_KEEPALIVE: int = config("SERVER_KEEPALIVE", cast=int, default=5)
+    SERVER_MAX_REQUESTS: int = config("SERVER_MAX_REQUESTS", cast=int, default=0)
+    SERVER_MAX_REQUESTS_JITTER: int = config(
+        "SERVER_MAX_REQUESTS_JITTER", cast=int, default=0
+    )
+
+
+class LoggingSettings(BaseSettings):
+    LOG_LEVEL: Literal["DEBUG", "INFO", "WARNING", "ERROR", "CRITICAL"] = config(
+        "LOG_LEVEL", default="INFO"
+    )
+    LOG_QUEUE_SIZE: int = config("LOG_QUEUE_SIZE", cast=int, default=10000)
+
+    @field_validator("LOG_LEVEL", mode="before")
+    @classmethod
+    def upper_log_level(cls, value: str) -> str:
+        return value.upper()
 
 
 class FirstUserSettings(BaseSettings):
@@ -86,7 +234,14 @@ class Settings(
     AppSettings,
     DatabaseSettings,
     PostgresSettings,
+    SQLiteSettings,
     CryptSettings,
+    LoginAdmissionSettings,
+    CacheSettings,
+    UserImportSettings,
+    MetricsSettings,
+    ServerSettings,
+    LoggingSettings,
     FirstUserSettings,
     TestSettings,
     EnvironmentSettings,
@@ -1,26 +1,321 @@
-from sqlalchemy.ext.asyncio import create_async_engine
+import asyncio
+import os
+import time
+from typing import Annotated, Any
+
+from fastapi import Depends
+from sqlalchemy import event, text
+from sqlalchemy.ext.asyncio import AsyncEngine, async_sessionmaker, create_async_engine
 from sqlalchemy.ext.asyncio.session import AsyncSession
-from sqlalchemy.orm import DeclarativeBase, MappedAsDataclass, sessionmaker
+from sqlalchemy.orm import DeclarativeBase, MappedAsDataclass
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
+
+from ..config import DatabaseBackendOption, settings
+from ..instrumentation import instrument_engine, record_pool_wait
+from ..logger import logging
+from ..metrics import Counter, Histogram
 
-from ..config import settings
+logger = logging.getLogger(__name__)
+
+DB_POOL_WAIT_SECONDS = Histogram(
+    "db_pool_wait_seconds", "Time spent waiting to check a connection out of the pool."
+)
+DB_CONNECTION_HOLD_SECONDS = Histogram(
+    "db_connection_hold_seconds",
+    "Time a connection stayed checked out of the pool.",
+)
+DB_READ_SESSIONS = Counter(
+    "db_read_sessions_total",
+    "Read-only sessions handed out, by the server they were bound to.",
+    labelnames=("target",),
+)
 
 
 class Base(DeclarativeBase, MappedAsDataclass):
     pass
 
 
-DATABASE_URI = settings.POSTGRES_URI
-DATABASE_PREFIX = settings.POSTGRES_ASYNC_PREFIX
+class InstrumentedAsyncQueuePool(AsyncAdaptedQueuePool):
+    """Queue pool that records how long each checkout waited for a connection."""
+
+    def _do_get(self) -> Any:
+        started = time.perf_counter()
+        try:
+            return super()._do_get()
+        finally:
+            waited = time.perf_counter() - started
+            DB_POOL_WAIT_SECONDS.observe(waited)
+            record_pool_wait(waited)
+
+
+# A named, shared-cache in-memory database, so every connection in the process
+# (including the tests' sync engine) sees the same tables.
+SQLITE_MEMORY_URI = "file:agents?mode=memory&cache=shared&uri=true"
+
+if settings.DATABASE_BACKEND == DatabaseBackendOption.SQLITE:
+    DATABASE_URI = (
+        SQLITE_MEMORY_URI if settings.SQLITE_URI == ":memory:" else settings.SQLITE_URI
+    )
+    DATABASE_PREFIX = settings.SQLITE_ASYNC_PREFIX
+    DATABASE_SYNC_PREFIX = settings.SQLITE_SYNC_PREFIX
+else:
+    DATABASE_URI = settings.POSTGRES_URI
+    DATABASE_PREFIX = settings.POSTGRES_ASYNC_PREFIX
+    DATABASE_SYNC_PREFIX = settings.POSTGRES_SYNC_PREFIX
 DATABASE_URL = f"{DATABASE_PREFIX}{DATABASE_URI}"
 
-async_engine = create_async_engine(DATABASE_URL, echo=False, future=True)
 
-local_session = sessionmaker(
-    bind=async_engine, class_=AsyncSession, expire_on_commit=False
+def pool_limits(
+    pool_size: int, max_overflow: int, max_connections: int | None, workers: int
+) -> tuple[int, int]:
+    """Per-worker pool size and overflow.
+
+    With `max_connections` set, both are scaled down so that `workers`
+    processes together never open more than that many connections.
+    """
+    if not max_connections:
+        return pool_size, max_overflow
+    per_worker = max(1, max_connections // max(1, workers))
+    size = min(pool_size, per_worker)
+    return size, min(max_overflow, per_worker - size)
+
+
+POOL_SIZE, POOL_MAX_OVERFLOW = pool_limits(
+    settings.POSTGRES_POOL_SIZE,
+    settings.POSTGRES_MAX_OVERFLOW,
+    settings.POSTGRES_MAX_CONNECTIONS,
+    settings.WEB_CONCURRENCY,
 )
+if DATABASE_URI == SQLITE_MEMORY_URI:
+    # The in-memory database lives as long as a connection to it, and a second
+    # connection would contend on shared-cache table locks. A pool of exactly
+    # one connection keeps it open and hands it to one session at a time.
+    POOL_SIZE, POOL_MAX_OVERFLOW = 1, 0
+
+
+def _on_checkout(dbapi_connection: Any, record: Any, proxy: Any) -> None:
+    record.info["checked_out_at"] = time.perf_counter()
+
+
+def _on_checkin(dbapi_connection: Any, record: Any) -> None:
+    checked_out_at = record.info.pop("checked_out_at", None)
+    if checked_out_at is not None:
+        DB_CONNECTION_HOLD_SECONDS.observe(time.perf_counter() - checked_out_at)
+
+
+def _set_sqlite_pragmas(dbapi_connection: Any, record: Any) -> None:
+    # Let SQLAlchemy, not the driver, emit BEGIN so SAVEPOINTs and
+    # transactional DDL work (see SQLAlchemy's pysqlite dialect notes).
+    dbapi_connection.isolation_level = None
+    cursor = dbapi_connection.cursor()
+    cursor.execute("PRAGMA foreign_keys=ON")
+    cursor.execute("PRAGMA busy_timeout=5000")
+    if DATABASE_URI != SQLITE_MEMORY_URI:
+        cursor.execute("PRAGMA journal_mode=WAL")
+    cursor.close()
+
+
+def _begin_sqlite_transaction(conn: Any) -> None:
+    conn.exec_driver_sql("BEGIN")
+
+
+def _create_sqlite_engine(url: str) -> AsyncEngine:
+    engine = create_async_engine(
+        url,
+        poolclass=InstrumentedAsyncQueuePool,
+        pool_size=POOL_SIZE,
+        max_overflow=POOL_MAX_OVERFLOW,
+        pool_timeout=settings.POSTGRES_POOL_TIMEOUT,
+        connect_args={"check_same_thread": False},
+    )
+    event.listen(engine.sync_engine, "connect", _set_sqlite_pragmas)
+    event.listen(engine.sync_engine, "begin", _begin_sqlite_transaction)
+    return engine
+
+
+def _create_postgres_engine(url: str) -> AsyncEngine:
+    server_settings = {}
+    if settings.POSTGRES_SCHEMA:
+        server_settings["search_path"] = settings.POSTGRES_SCHEMA
+
+    return create_async_engine(
+        url,
+        echo=False,
+        future=True,
+        poolclass=InstrumentedAsyncQueuePool,
+        pool_size=POOL_SIZE,
+        max_overflow=POOL_MAX_OVERFLOW,
+        pool_timeout=settings.POSTGRES_POOL_TIMEOUT,
+        pool_recycle=settings.POSTGRES_POOL_RECYCLE,
+        pool_pre_ping=settings.POSTGRES_POOL_PRE_PING,
+        connect_args={
+            # SQLAlchemy's prepared statement cache and asyncpg's own; set both
+            # to 0 behind a transaction-mode pgbouncer.
+            "prepared_statement_cache_size": settings.POSTGRES_STATEMENT_CACHE_SIZE,
+            "statement_cache_size": settings.POSTGRES_STATEMENT_CACHE_SIZE,
+            "server_settings": server_settings,
+        },
+    )
+
+
+def _create_engine(url: str) -> AsyncEngine:
+    if url.startswith(settings.SQLITE_ASYNC_PREFIX):
+        engine = _create_sqlite_engine(url)
+    else:
+        engine = _create_postgres_engine(url)
+
+    event.listen(engine.sync_engine.pool, "checkout", _on_checkout)
+    event.listen(engine.sync_engine.pool, "checkin", _on_checkin)
+    instrument_engine(engine.sync_engine)
+    return engine
+
+
+async_engine = _create_engine(DATABASE_URL)
+
+local_session = async_sessionmaker(bind=async_engine, expire_on_commit=False)
+
+
+def pool_status() -> dict[str, Any]:
+    pool: QueuePool = async_engine.pool
+    return {
+        "pool_size": pool.size(),
+        "checked_in": pool.checkedin(),
+        "checked_out": pool.checkedout(),
+        "overflow": pool.overflow(),
+        "max_overflow": POOL_MAX_OVERFLOW,
+        "checkouts": DB_POOL_WAIT_SECONDS.count(),
+        "wait_seconds_total": DB_POOL_WAIT_SECONDS.sum(),
+    }
 
 
 async def async_get_db() -> AsyncSession:
+    """Request-scoped session.
+
+    Creating the session does not touch the pool: a connection is checked out
+    on the first statement and returned when the transaction ends, so handlers
+    that never query (e.g. cached auth) hold no connection at all. Handlers
+    should call `release_connection` after their last read.
+    """
     async_session = local_session
     async with async_session() as db:
         yield db
+
+
+async def release_connection(db: AsyncSession) -> None:
+    """Return the session's connection to the pool, keeping the session usable.
+
+    Ends the current transaction, so only call it once any writes have been
+    committed. A later statement transparently checks out a new connection.
+    """
+    await db.close()
+
+
+# -------------- read replica --------------
+class ReplicaMonitor:
+    """Tracks whether the replica is reachable and within the allowed lag.
+
+    The check runs lazily from the request path at most once per
+    `check_interval`; concurrent requests keep using the last known state.
+    """
+
+    def __init__(
+        self, engine: AsyncEngine, max_lag: float, check_interval: float
+    ) -> None:
+        self.engine = engine
+        self.max_lag = max_lag
+        self.check_interval = check_interval
+        self.healthy = False
+        self._checked_at = float("-inf")
+        self._lock = asyncio.Lock()
+
+    async def _replication_lag(self) -> float:
+        async with self.engine.connect() as conn:
+            # The last replay timestamp stops moving while the primary is idle,
+            # so a replica that has replayed everything it received is not
+            # lagging however old that timestamp is.
+            lag = await conn.scalar(
+                text(
+                    "SELECT CASE WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() "
+                    "THEN 0 ELSE COALESCE(EXTRACT(EPOCH FROM "
+                    "now() - pg_last_xact_replay_timestamp()), 0) END"
+                )
+            )
+        return float(lag)
+
+    async def is_usable(self) -> bool:
+        if time.monotonic() - self._checked_at < self.check_interval:
+            return self.healthy
+        if self._lock.locked():
+            return self.healthy
+
+        async with self._lock:
+            try:
+                lag = await asyncio.wait_for(self._replication_lag(), timeout=1.0)
+                healthy = lag <= self.max_lag
+                if not healthy:
+                    logger.warning(
+                        "Replica lags %.1fs behind, reading from primary", lag
+                    )
+            except Exception:
+                logger.exception("Replica check failed, reading from primary")
+                healthy = False
+            self.healthy = healthy
+            self._checked_at = time.monotonic()
+        return self.healthy
+
+
+replica_engine: AsyncEngine | None = None
+replica_session: async_sessionmaker | None = None
+replica_monitor: ReplicaMonitor | None = None
+if (
+    settings.DATABASE_BACKEND == DatabaseBackendOption.POSTGRES
+    and settings.POSTGRES_REPLICA_URI
+):
+    replica_engine = _create_engine(f"{DATABASE_PREFIX}{settings.POSTGRES_REPLICA_URI}")
+    replica_session = async_sessionmaker(bind=replica_engine, expire_on_commit=False)
+    replica_monitor = ReplicaMonitor(
+        replica_engine,
+        max_lag=settings.POSTGRES_REPLICA_MAX_LAG_SECONDS,
+        check_interval=settings.POSTGRES_REPLICA_CHECK_SECONDS,
+    )
+
+
+def _engines() -> list[AsyncEngine]:
+    return [engine for engine in (async_engine, replica_engine) if engine is not None]
+
+
+def reset_pools_after_fork() -> None:
+    """Give a forked worker empty pools of its own.
+
+    Connections inherited from the parent are dropped without being closed,
+    since closing them would also end the parent's sessions on those sockets.
+    """
+    for engine in _engines():
+        engine.sync_engine.dispose(close=False)
+
+
+async def dispose_engines() -> None:
+    """Close the worker's pooled connections on shutdown."""
+    for engine in _engines():
+        if engine.url.query.get("mode") == "memory":
+            continue  # closing its only connection would drop the database
+        await engine.dispose()
+
+
+# gunicorn forks workers from a parent that has already imported the app.
+os.register_at_fork(after_in_child=reset_pools_after_fork)
+
+
+async def async_get_read_db(
+    db: Annotated[AsyncSession, Depends(async_get_db)]
+) -> AsyncSession:
+    """Session for read-only work: the replica when one is configured and
+    healthy, otherwise the request's primary session (no extra connection)."""
+    if replica_monitor is None or not await replica_monitor.is_usable():
+        DB_READ_SESSIONS.inc(target="primary")
+        yield db
+        return
+
+    DB_READ_SESSIONS.inc(target="replica")
+    async with replica_session() as read_db:
+        yield read_db
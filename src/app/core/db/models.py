@@ -1,28 +1,26 @@
 import uuid as uuid_pkg
 from datetime import UTC, datetime
 
-from sqlalchemy import Boolean, Column, DateTime, text
-from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy import Boolean, Column, DateTime, Uuid, func
+
+
+def _utcnow() -> datetime:
+    return datetime.now(UTC)
 
 
 class UUIDMixin:
-    uuid: uuid_pkg.UUID = Column(
-        UUID,
-        primary_key=True,
-        default=uuid_pkg.uuid4,
-        server_default=text("gen_random_uuid()"),
-    )
+    uuid: uuid_pkg.UUID = Column(Uuid, primary_key=True, default=uuid_pkg.uuid4)
 
 
 class TimestampMixin:
     created_at: datetime = Column(
-        DateTime, default=datetime.now(UTC), server_default=text("current_timestamp(0)")
+        DateTime, default=_utcnow, server_default=func.current_timestamp()
     )
     updated_at: datetime = Column(
         DateTime,
         nullable=True,
-        onupdate=datetime.now(UTC),
-        server_default=text("current_timestamp(0)"),
+        onupdate=_utcnow,
+        server_default=func.current_timestamp(),
     )
 
 
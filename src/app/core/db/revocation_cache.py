@@ -0,0 +1,101 @@
+import asyncio
+from collections.abc import Callable
+from datetime import UTC, datetime
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from ..logger import logging
+from ..metrics import Counter, Gauge
+from .token_blacklist import TokenBlacklist
+
+logger = logging.getLogger(__name__)
+
+REVOCATION_CACHE_SIZE = Gauge(
+    "revocation_cache_size", "Revoked tokens held in the in-process cache."
+)
+REVOCATION_CACHE_LOOKUPS = Counter(
+    "revocation_cache_lookups_total",
+    "Token revocation checks answered by the cache.",
+    labelnames=("result",),
+)
+
+# Sequence values are handed out before commit, so a row with a lower id can
+# become visible after one with a higher id. Re-reading a short window below the
+# high-water mark on every poll picks those rows up; adds are idempotent.
+POLL_LOOKBACK_IDS = 1000
+
+
+def _now() -> datetime:
+    return datetime.now(UTC).replace(tzinfo=None)
+
+
+class RevocationCache:
+    """In-memory mirror of `token_blacklist` for the authenticated request path.
+
+    The set is loaded once at startup, updated locally by `blacklist_token` and
+    kept coherent with other workers by polling for rows above the highest `id`
+    seen so far. Entries are keyed by `token_digest` and only kept until they
+    expire, since an expired JWT is rejected by signature verification anyway.
+    """
+
+    def __init__(self, poll_interval: float) -> None:
+        self.poll_interval = poll_interval
+        self.loaded = False
+        self._revoked: dict[bytes, datetime] = {}
+        self._high_water_mark = 0
+
+    def __contains__(self, token_digest: bytes) -> bool:
+        revoked = token_digest in self._revoked
+        REVOCATION_CACHE_LOOKUPS.inc(result="revoked" if revoked else "valid")
+        return revoked
+
+    def __len__(self) -> int:
+        return len(self._revoked)
+
+    def add(self, token_digest: bytes, expires_at: datetime) -> None:
+        self._revoked[token_digest] = expires_at
+        REVOCATION_CACHE_SIZE.set(len(self._revoked))
+
+    def _prune(self) -> None:
+        now = _now()
+        expired = [key for key, expires in self._revoked.items() if expires <= now]
+        for key in expired:
+            del self._revoked[key]
+        REVOCATION_CACHE_SIZE.set(len(self._revoked))
+
+    async def _fetch(self, db: AsyncSession, after_id: int) -> None:
+        stmt = select(
+            TokenBlacklist.id, TokenBlacklist.token_digest, TokenBlacklist.expires_at
+        ).where(TokenBlacklist.id > after_id, TokenBlacklist.expires_at > _now())
+        result = await db.execute(stmt)
+        for row_id, token_digest, expires_at in result.all():
+            self._revoked[token_digest] = expires_at
+            self._high_water_mark = max(self._high_water_mark, row_id)
+
+    async def load(self, db: AsyncSession) -> None:
+        self._revoked.clear()
+        self._high_water_mark = 0
+        await self._fetch(db, after_id=0)
+        self.loaded = True
+        REVOCATION_CACHE_SIZE.set(len(self._revoked))
+        logger.info("Loaded %d revoked tokens into the cache", len(self._revoked))
+
+    async def refresh(self, db: AsyncSession) -> None:
+        await self._fetch(
+            db, after_id=max(0, self._high_water_mark - POLL_LOOKBACK_IDS)
+        )
+        self._prune()
+
+    async def run(self, session_factory: Callable[[], AsyncSession]) -> None:
+        """Poll for revocations made by other workers until cancelled."""
+        while True:
+            await asyncio.sleep(self.poll_interval)
+            try:
+                async with session_factory() as db:
+                    if self.loaded:
+                        await self.refresh(db)
+                    else:
+                        await self.load(db)
+            except Exception:
+                logger.exception("Failed to refresh the token revocation cache")
@@ -1,6 +1,6 @@
 from datetime import datetime
 
-from sqlalchemy import DateTime, String
+from sqlalchemy import DateTime, LargeBinary
 from sqlalchemy.orm import Mapped, mapped_column
 
 from .database import Base
@@ -17,5 +17,7 @@ class TokenBlacklist(Base):
         primary_key=True,
         init=False,
     )
-    token: Mapped[str] = mapped_column(String, unique=True, index=True)
+    token_digest: Mapped[bytes] = mapped_column(
+        LargeBinary(16), unique=True, index=True
+    )
     expires_at: Mapped[datetime] = mapped_column(DateTime)
@@ -0,0 +1,222 @@
+import asyncio
+import time
+import zlib
+from collections.abc import AsyncIterator, Callable
+from contextlib import asynccontextmanager
+from datetime import UTC, date, datetime, timedelta
+
+from sqlalchemy import delete, select, text
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncSession
+
+from ..logger import logging
+from ..metrics import Counter, Histogram
+from .token_blacklist import TokenBlacklist
+
+logger = logging.getLogger(__name__)
+
+TOKEN_BLACKLIST_ROWS_PURGED = Counter(
+    "token_blacklist_rows_purged_total",
+    "Expired token_blacklist rows removed by the sweeper.",
+    labelnames=("method",),
+)
+TOKEN_BLACKLIST_SWEEP_SECONDS = Histogram(
+    "token_blacklist_sweep_seconds",
+    "Duration of one token_blacklist sweep.",
+)
+
+PARTITION_PREFIX = "token_blacklist_p"
+SWEEPER_LOCK_KEY = zlib.crc32(b"token_blacklist_sweeper")
+
+
+def _now() -> datetime:
+    return datetime.now(UTC).replace(tzinfo=None)
+
+
+def partition_name(day: date) -> str:
+    return f"{PARTITION_PREFIX}{day:%Y%m%d}"
+
+
+# -------------- batched purge --------------
+async def purge_expired_tokens(db: AsyncSession, batch_size: int) -> int:
+    """Delete expired rows in batches of `batch_size`, committing between batches
+    so no single statement holds locks on a large part of the index."""
+    purged = 0
+    while True:
+        expired_ids = (
+            select(TokenBlacklist.id)
+            .where(TokenBlacklist.expires_at <= _now())
+            .limit(batch_size)
+            .scalar_subquery()
+        )
+        result = await db.execute(
+            delete(TokenBlacklist).where(TokenBlacklist.id.in_(expired_ids))
+        )
+        await db.commit()
+        purged += result.rowcount
+        if result.rowcount < batch_size:
+            return purged
+        await asyncio.sleep(0)
+
+
+# -------------- partitions (PostgreSQL) --------------
+async def create_partitions(conn: AsyncConnection, start: date, days: int) -> None:
+    for offset in range(days):
+        day = start + timedelta(days=offset)
+        await conn.execute(
+            text(
+                f"CREATE TABLE IF NOT EXISTS {partition_name(day)} "
+                "PARTITION OF token_blacklist "
+                f"FOR VALUES FROM ('{day.isoformat()}') "
+                f"TO ('{(day + timedelta(days=1)).isoformat()}')"
+            )
+        )
+
+
+async def drop_expired_partitions(conn: AsyncConnection) -> int:
+    """Drop daily partitions whose whole range lies in the past.
+
+    Returns the planner's estimate of the rows dropped with them, which avoids
+    scanning each partition just to count it.
+    """
+    result = await conn.execute(
+        text(
+            "SELECT child.relname, child.reltuples FROM pg_inherits "
+            "JOIN pg_class parent ON pg_inherits.inhparent = parent.oid "
+            "JOIN pg_class child ON pg_inherits.inhrelid = child.oid "
+            "WHERE parent.oid = to_regclass('token_blacklist') "
+            "AND child.relname LIKE :prefix"
+        ),
+        {"prefix": f"{PARTITION_PREFIX}%"},
+    )
+    today = partition_name(_now().date())
+    dropped_rows = 0
+    for name, estimated_rows in result.all():
+        if name >= today:
+            continue
+        dropped_rows += max(0, int(estimated_rows))  # -1 when never analyzed
+        await conn.execute(text(f"DROP TABLE {name}"))
+    return dropped_rows
+
+
+async def partition_token_blacklist(conn: AsyncConnection, days_ahead: int) -> None:
+    """Convert `token_blacklist` into a table range-partitioned by `expires_at` day.
+
+    Live rows are copied over and the `id` sequence is kept, so the revocation
+    cache's high-water mark stays valid. PostgreSQL requires the partition key
+    in every unique constraint, hence the composite primary key and index.
+    """
+    statements = [
+        "ALTER TABLE token_blacklist RENAME TO token_blacklist_unpartitioned",
+        "ALTER TABLE token_blacklist_unpartitioned "
+        "RENAME CONSTRAINT token_blacklist_pkey TO token_blacklist_unpartitioned_pkey",
+        "ALTER INDEX ix_token_blacklist_token_digest "
+        "RENAME TO ix_token_blacklist_unpartitioned_token_digest",
+        "CREATE TABLE token_blacklist ("
+        " id INTEGER NOT NULL DEFAULT nextval('token_blacklist_id_seq'),"
+        " token_digest BYTEA NOT NULL,"
+        " expires_at TIMESTAMP WITHOUT TIME ZONE NOT NULL,"
+        " CONSTRAINT token_blacklist_pkey PRIMARY KEY (id, expires_at)"
+        ") PARTITION BY RANGE (expires_at)",
+        "CREATE UNIQUE INDEX ix_token_blacklist_token_digest "
+        "ON token_blacklist (token_digest, expires_at)",
+        "CREATE TABLE token_blacklist_default PARTITION OF token_blacklist DEFAULT",
+    ]
+    for statement in statements:
+        await conn.execute(text(statement))
+
+    await create_partitions(conn, _now().date(), days_ahead)
+    await conn.execute(
+        text(
+            "INSERT INTO token_blacklist (id, token_digest, expires_at) "
+            "SELECT id, token_digest, expires_at FROM token_blacklist_unpartitioned "
+            "WHERE expires_at > :now"
+        ),
+        {"now": _now()},
+    )
+    await conn.execute(
+        text("ALTER SEQUENCE token_blacklist_id_seq OWNED BY token_blacklist.id")
+    )
+    await conn.execute(text("DROP TABLE token_blacklist_unpartitioned"))
+
+
+# -------------- sweeper --------------
+@asynccontextmanager
+async def sweeper_lock(
+    session_factory: Callable[[], AsyncSession],
+) -> AsyncIterator[bool]:
+    """Whether this process may sweep now.
+
+    Every worker runs a sweeper, but on PostgreSQL only the one holding an
+    advisory lock sweeps, so they do not race on the partition DDL. The lock is
+    held by a separate session's transaction and released when it closes.
+    """
+    async with session_factory() as lock_db:
+        if lock_db.bind.dialect.name != "postgresql":
+            yield True
+            return
+
+        acquired = await lock_db.scalar(
+            text("SELECT pg_try_advisory_xact_lock(:key)"), {"key": SWEEPER_LOCK_KEY}
+        )
+        yield bool(acquired)
+
+
+async def sweep_token_blacklist(
+    session_factory: Callable[[], AsyncSession],
+    batch_size: int,
+    partitioned: bool = False,
+    days_ahead: int = 0,
+) -> int:
+    async with sweeper_lock(session_factory) as acquired:
+        if not acquired:
+            return 0
+        return await _sweep(session_factory, batch_size, partitioned, days_ahead)
+
+
+async def _sweep(
+    session_factory: Callable[[], AsyncSession],
+    batch_size: int,
+    partitioned: bool,
+    days_ahead: int,
+) -> int:
+    started = time.perf_counter()
+    purged = 0
+    async with session_factory() as db:
+        if partitioned:
+            conn = await db.connection()
+            await create_partitions(conn, _now().date(), days_ahead)
+            dropped = await drop_expired_partitions(conn)
+            await db.commit()
+            TOKEN_BLACKLIST_ROWS_PURGED.inc(dropped, method="partition_drop")
+            purged += dropped
+
+        # Also covers today's partition and the default partition when partitioned.
+        deleted = await purge_expired_tokens(db, batch_size=batch_size)
+        TOKEN_BLACKLIST_ROWS_PURGED.inc(deleted, method="delete")
+        purged += deleted
+
+    TOKEN_BLACKLIST_SWEEP_SECONDS.observe(time.perf_counter() - started)
+    return purged
+
+
+async def run_token_blacklist_sweeper(
+    session_factory: Callable[[], AsyncSession],
+    interval: float,
+    batch_size: int,
+    partitioned: bool = False,
+    days_ahead: int = 0,
+) -> None:
+    """Sweep expired revocations every `interval` seconds until cancelled."""
+    while True:
+        try:
+            purged = await sweep_token_blacklist(
+                session_factory,
+                batch_size=batch_size,
+                partitioned=partitioned,
+                days_ahead=days_ahead,
+            )
+            if purged:
+                logger.info("Purged %d expired token_blacklist rows", purged)
+        except Exception:
+            logger.exception("Failed to sweep token_blacklist")
+        await asyncio.sleep(interval)
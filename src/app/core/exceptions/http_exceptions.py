@@ -1,4 +1,5 @@
 # ruff: noqa
+from fastapi import status
 from fastcrud.exceptions.http_exceptions import (
     BadRequestException,
     CustomException,
@@ -8,3 +9,15 @@ from fastcrud.exceptions.http_exceptions import (
     UnauthorizedException,
     UnprocessableEntityException,
 )
+
+
+class ServiceUnavailableException(CustomException):
+    def __init__(self, detail: str | None = None, retry_after: int = 1) -> None:
+        super().__init__(status_code=status.HTTP_503_SERVICE_UNAVAILABLE, detail=detail)
+        self.headers = {"Retry-After": str(retry_after)}
+
+
+class TooManyRequestsException(CustomException):
+    def __init__(self, detail: str | None = None, retry_after: int = 1) -> None:
+        super().__init__(status_code=status.HTTP_429_TOO_MANY_REQUESTS, detail=detail)
+        self.headers = {"Retry-After": str(retry_after)}
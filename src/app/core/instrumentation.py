@@ -0,0 +1,144 @@
+import time
+from contextvars import ContextVar
+from dataclasses import dataclass
+from typing import Any
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from .metrics import Histogram
+
+QUERY_COUNT_BUCKETS = (0, 1, 2, 3, 5, 10, 20, 50, 100)
+
+REQUEST_LATENCY_SECONDS = Histogram(
+    "http_request_duration_seconds",
+    "Request latency by route template.",
+    labelnames=("method", "route", "status"),
+)
+REQUEST_DB_SECONDS = Histogram(
+    "http_request_db_seconds",
+    "Time per request spent executing SQL statements.",
+    labelnames=("method", "route"),
+)
+REQUEST_DB_QUERIES = Histogram(
+    "http_request_db_queries",
+    "SQL statements executed per request.",
+    labelnames=("method", "route"),
+    buckets=QUERY_COUNT_BUCKETS,
+)
+REQUEST_DB_POOL_WAIT_SECONDS = Histogram(
+    "http_request_db_pool_wait_seconds",
+    "Time per request spent waiting for a pooled connection.",
+    labelnames=("method", "route"),
+)
+REQUEST_PASSWORD_SECONDS = Histogram(
+    "http_request_password_seconds",
+    "Time per request spent waiting on bcrypt, including the worker queue.",
+    labelnames=("method", "route"),
+)
+
+
+@dataclass
+class RequestStats:
+    db_seconds: float = 0.0
+    db_queries: int = 0
+    pool_wait_seconds: float = 0.0
+    password_seconds: float = 0.0
+
+
+# Holds the current request's stats. The object is mutated in place, so code
+# running in child tasks or SQLAlchemy's greenlets (which copy the context)
+# still reports into it.
+_request_stats: ContextVar[RequestStats | None] = ContextVar(
+    "request_stats", default=None
+)
+
+
+def current_request_stats() -> RequestStats | None:
+    return _request_stats.get()
+
+
+def record_pool_wait(seconds: float) -> None:
+    stats = _request_stats.get()
+    if stats is not None:
+        stats.pool_wait_seconds += seconds
+
+
+def record_password_time(seconds: float) -> None:
+    stats = _request_stats.get()
+    if stats is not None:
+        stats.password_seconds += seconds
+
+
+# -------------- database --------------
+# The start time lives on the statement's execution context rather than the
+# connection, so a statement that fails (and never reaches after_cursor_execute)
+# leaves nothing behind.
+def _before_cursor_execute(
+    conn: Any, cursor: Any, statement: str, parameters: Any, context: Any, *args: Any
+) -> None:
+    if context is not None:
+        context.query_started_at = time.perf_counter()
+
+
+def _after_cursor_execute(
+    conn: Any, cursor: Any, statement: str, parameters: Any, context: Any, *args: Any
+) -> None:
+    started = getattr(context, "query_started_at", None)
+    stats = _request_stats.get()
+    if started is not None and stats is not None:
+        stats.db_seconds += time.perf_counter() - started
+        stats.db_queries += 1
+
+
+def instrument_engine(engine: Engine) -> None:
+    """Attribute each statement's execution time to the current request."""
+    event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+
+
+# -------------- middleware --------------
+class RequestMetricsMiddleware:
+    """Records latency, DB time and bcrypt time per route template.
+
+    Routes are labelled by their path template (`/api/v1/user/{username}`), not
+    the raw path, to keep the number of series bounded; requests that match no
+    route share the `unmatched` label.
+    """
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        stats = RequestStats()
+        token = _request_stats.set(stats)
+        status_code = 500
+        started = time.perf_counter()
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            duration = time.perf_counter() - started
+            _request_stats.reset(token)
+
+            route = scope.get("route")
+            labels = {
+                "method": scope["method"],
+                "route": getattr(route, "path", "unmatched"),
+            }
+            REQUEST_LATENCY_SECONDS.observe(duration, status=str(status_code), **labels)
+            REQUEST_DB_SECONDS.observe(stats.db_seconds, **labels)
+            REQUEST_DB_QUERIES.observe(stats.db_queries, **labels)
+            REQUEST_DB_POOL_WAIT_SECONDS.observe(stats.pool_wait_seconds, **labels)
+            REQUEST_PASSWORD_SECONDS.observe(stats.password_seconds, **labels)
@@ -1,6 +1,11 @@
+import atexit
 import logging
 import os
-from logging.handlers import RotatingFileHandler
+import queue
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
+
+from .config import settings
+from .metrics import Counter
 
 LOG_DIR = os.path.join(os.path.dirname(os.path.dirname(__file__)), "logs")
 if not os.path.exists(LOG_DIR):
@@ -8,13 +13,72 @@ if not os.path.exists(LOG_DIR):
 
 LOG_FILE_PATH = os.path.join(LOG_DIR, "app.log")
 
-LOGGING_LEVEL = logging.INFO
+LOGGING_LEVEL = logging.getLevelName(settings.LOG_LEVEL)
 LOGGING_FORMAT = "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
 
-logging.basicConfig(level=LOGGING_LEVEL, format=LOGGING_FORMAT)
+LOG_RECORDS_DROPPED = Counter(
+    "log_records_dropped_total",
+    "Log records discarded because the logging queue was full.",
+)
+
+
+class DroppingQueueHandler(QueueHandler):
+    """Hands records to a background listener without blocking the caller.
+
+    Records are passed through unformatted, so message interpolation happens on
+    the listener thread; when the bounded queue is full the record is dropped
+    and counted instead of stalling the event loop.
+    """
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        return record
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            LOG_RECORDS_DROPPED.inc()
+
+
+formatter = logging.Formatter(LOGGING_FORMAT)
+
+console_handler = logging.StreamHandler()
+console_handler.setFormatter(formatter)
 
 file_handler = RotatingFileHandler(LOG_FILE_PATH, maxBytes=10485760, backupCount=5)
-file_handler.setLevel(LOGGING_LEVEL)
-file_handler.setFormatter(logging.Formatter(LOGGING_FORMAT))
+file_handler.setFormatter(formatter)
+
+log_queue: queue.Queue = queue.Queue(maxsize=settings.LOG_QUEUE_SIZE)
+queue_handler = DroppingQueueHandler(log_queue)
+
+root_logger = logging.getLogger("")
+root_logger.setLevel(LOGGING_LEVEL)
+root_logger.addHandler(queue_handler)
+
+
+def _start_listener() -> QueueListener:
+    """Start a listener writing the queued records to the console and file."""
+    started = QueueListener(log_queue, console_handler, file_handler)
+    started.start()
+    return started
+
+
+def _stop_listener() -> None:
+    listener.stop()
+
+
+def _restart_listener_after_fork() -> None:
+    """Start a listener in a forked child, which inherits no threads.
+
+    The queue is replaced too, because the parent's listener thread may have
+    held its lock at the time of the fork.
+    """
+    global log_queue, listener
+    log_queue = queue.Queue(maxsize=settings.LOG_QUEUE_SIZE)
+    queue_handler.queue = log_queue
+    listener = _start_listener()
+
 
-logging.getLogger("").addHandler(file_handler)
+listener = _start_listener()
+atexit.register(_stop_listener)
+os.register_at_fork(after_in_child=_restart_listener_after_fork)
@@ -0,0 +1,81 @@
+import base64
+import binascii
+from typing import Any
+
+from fastcrud.paginated import PaginatedListResponse
+from fastcrud.paginated.schemas import SchemaType
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from .exceptions.http_exceptions import BadRequestException
+
+MAX_ITEMS_PER_PAGE = 100
+
+
+class CursorPaginatedListResponse(PaginatedListResponse[SchemaType]):
+    total_count: int | None = None
+    total_count_exact: bool | None = None
+    next_cursor: str | None = None
+
+
+def encode_cursor(value: int) -> str:
+    return base64.urlsafe_b64encode(str(value).encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> int:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        return int(base64.urlsafe_b64decode(padded.encode()).decode())
+    except (binascii.Error, UnicodeDecodeError, ValueError):
+        raise BadRequestException("Invalid cursor.")
+
+
+def cursor_paginated_response(
+    crud_data: dict,
+    items_per_page: int,
+    page: int | None = None,
+    total_count: int | None = None,
+    total_count_exact: bool | None = None,
+    cursor_column: str = "id",
+) -> dict[str, Any]:
+    """Create a paginated response from a query that fetched `items_per_page + 1` rows.
+
+    The extra row only tells whether another page exists, so `has_more` does not
+    depend on a total count. `next_cursor` points past the last returned row and
+    can be passed back as `after` to continue with a keyset query.
+    """
+    data = crud_data["data"]
+    has_more = len(data) > items_per_page and items_per_page > 0
+    data = data[:items_per_page]
+
+    return {
+        "data": data,
+        "total_count": total_count,
+        "total_count_exact": total_count_exact,
+        "has_more": has_more,
+        "page": page,
+        "items_per_page": items_per_page,
+        "next_cursor": encode_cursor(data[-1][cursor_column]) if has_more else None,
+    }
+
+
+async def estimated_row_count(db: AsyncSession, table_name: str) -> int | None:
+    """Planner estimate of a table's row count from `pg_class.reltuples`.
+
+    Returns None on other backends or when the table was never analyzed. The
+    estimate covers the whole table, ignoring any filter of the listing.
+    """
+    if db.bind.dialect.name != "postgresql":
+        return None
+
+    # Resolve the name through the search_path, as queries on the table do;
+    # the same table name may exist in several schemas.
+    quoted_name = db.bind.dialect.identifier_preparer.quote_identifier(table_name)
+    result = await db.execute(
+        text("SELECT reltuples::bigint FROM pg_class WHERE oid = to_regclass(:name)"),
+        {"name": quoted_name},
+    )
+    estimate = result.scalar_one_or_none()
+    if estimate is None or estimate < 0:
+        return None
+    return int(estimate)
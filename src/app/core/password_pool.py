@@ -0,0 +1,125 @@
+import asyncio
+import os
+import time
+from collections.abc import Callable
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Any, Literal
+
+import bcrypt
+
+from .instrumentation import record_password_time
+from .metrics import Counter, Gauge, Histogram
+
+PASSWORD_POOL_QUEUE_DEPTH = Gauge(
+    "password_pool_queue_depth",
+    "Password operations waiting for a free worker.",
+)
+PASSWORD_POOL_IN_FLIGHT = Gauge(
+    "password_pool_in_flight",
+    "Password operations submitted to the pool and not yet finished.",
+)
+PASSWORD_POOL_WAIT_SECONDS = Histogram(
+    "password_pool_wait_seconds",
+    "Time a password operation waited in the queue before a worker picked it up.",
+)
+PASSWORD_HASH_SECONDS = Histogram(
+    "password_hash_seconds",
+    "Time spent inside bcrypt per operation.",
+    labelnames=("operation",),
+)
+PASSWORD_POOL_OPERATIONS = Counter(
+    "password_pool_operations_total",
+    "Password operations completed by the pool.",
+    labelnames=("operation",),
+)
+
+
+def hash_password(password: str) -> str:
+    hashed_password: str = bcrypt.hashpw(password.encode(), bcrypt.gensalt()).decode()
+    return hashed_password
+
+
+def check_password(plain_password: str, hashed_password: str) -> bool:
+    correct_password: bool = bcrypt.checkpw(
+        plain_password.encode(), hashed_password.encode()
+    )
+    return correct_password
+
+
+def _timed(func: Callable[..., Any], *args: Any) -> tuple[float, float, Any]:
+    # time.monotonic is system-wide on Linux, so the start timestamp is
+    # comparable with the submit timestamp even when running in a child process.
+    started = time.monotonic()
+    result = func(*args)
+    return started, time.monotonic() - started, result
+
+
+class PasswordWorkerPool:
+    """Runs bcrypt work on a dedicated, fixed-size executor off the event loop.
+
+    bcrypt releases the GIL while hashing, so the default thread executor gives
+    real parallelism; the process executor is available for interpreters or
+    builds where that is not the case.
+    """
+
+    def __init__(
+        self, max_workers: int, executor: Literal["thread", "process"] = "thread"
+    ) -> None:
+        self.max_workers = max_workers
+        self.executor_type = executor
+        self._executor: Executor | None = None
+        self._in_flight = 0
+        os.register_at_fork(after_in_child=self._forget_executor)
+
+    def _forget_executor(self) -> None:
+        # A forked child inherits the executor but not its worker threads or
+        # processes; start a new one on first use instead of queueing forever.
+        self._executor = None
+        self._in_flight = 0
+
+    def _get_executor(self) -> Executor:
+        if self._executor is None:
+            if self.executor_type == "process":
+                self._executor = ProcessPoolExecutor(max_workers=self.max_workers)
+            else:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.max_workers, thread_name_prefix="password"
+                )
+        return self._executor
+
+    def _track(self, delta: int) -> None:
+        self._in_flight += delta
+        PASSWORD_POOL_IN_FLIGHT.set(self._in_flight)
+        PASSWORD_POOL_QUEUE_DEPTH.set(max(0, self._in_flight - self.max_workers))
+
+    async def run(self, func: Callable[..., Any], *args: Any) -> Any:
+        loop = asyncio.get_running_loop()
+        submitted = time.monotonic()
+        self._track(1)
+        try:
+            started, duration, result = await loop.run_in_executor(
+                self._get_executor(), _timed, func, *args
+            )
+        finally:
+            self._track(-1)
+            record_password_time(time.monotonic() - submitted)
+
+        PASSWORD_POOL_WAIT_SECONDS.observe(max(0.0, started - submitted))
+        PASSWORD_HASH_SECONDS.observe(duration, operation=func.__name__)
+        PASSWORD_POOL_OPERATIONS.inc(operation=func.__name__)
+        return result
+
+    async def hash(self, password: str) -> str:
+        hashed_password: str = await self.run(hash_password, password)
+        return hashed_password
+
+    async def verify(self, plain_password: str, hashed_password: str) -> bool:
+        correct_password: bool = await self.run(
+            check_password, plain_password, hashed_password
+        )
+        return correct_password
+
+    def shutdown(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
@@ -0,0 +1,57 @@
+from typing import Any
+
+from fastapi import Request
+from fastapi.datastructures import DefaultPlaceholder
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional dependency
+    orjson = None
+
+
+def _default(obj: Any) -> Any:
+    return jsonable_encoder(obj)
+
+
+class FastJSONResponse(JSONResponse):
+    """JSON response rendered by orjson straight to bytes.
+
+    Output matches the stdlib `JSONResponse` FastAPI uses by default: compact
+    separators, UTF-8 without escaping, and datetimes, UUIDs and dataclasses
+    formatted the way pydantic's JSON mode does (UTC as `Z`). Types orjson does
+    not know are handed to `jsonable_encoder`.
+    """
+
+    def render(self, content: Any) -> bytes:
+        return orjson.dumps(
+            content,
+            default=_default,
+            option=orjson.OPT_NON_STR_KEYS | orjson.OPT_UTC_Z,
+        )
+
+
+def default_response_class(fast_json: bool) -> type[JSONResponse]:
+    """`FastJSONResponse` if requested and orjson is installed, else stdlib JSON."""
+    if fast_json and orjson is not None:
+        return FastJSONResponse
+    return JSONResponse
+
+
+def trusted_response(
+    request: Request, content: Any, status_code: int = 200
+) -> JSONResponse:
+    """Render rows straight from the database, skipping `response_model`.
+
+    FastAPI validates a handler's return value against its `response_model`
+    unless it is already a Response. Rows selected with `schema_to_select` have
+    exactly the schema's columns and were validated on the way in, so checking
+    them again (EmailStr, patterns, ...) only costs time. Keep `response_model`
+    on the route for the OpenAPI schema. The response class is the app's
+    `default_response_class`, as FastAPI would have used.
+    """
+    response_class = request.app.router.default_response_class
+    if isinstance(response_class, DefaultPlaceholder):
+        response_class = response_class.value
+    return response_class(content, status_code=status_code)
@@ -11,6 +11,16 @@ class HealthCheck(BaseModel):
     description: str
 
 
+class DatabasePoolStatus(BaseModel):
+    pool_size: int
+    checked_in: int
+    checked_out: int
+    overflow: int
+    max_overflow: int
+    checkouts: int
+    wait_seconds_total: float
+
+
 # -------------- mixins --------------
 class UUIDSchema(BaseModel):
     uuid: uuid_pkg.UUID = Field(default_factory=uuid_pkg.uuid4)
@@ -62,7 +72,7 @@ class TokenData(BaseModel):
 
 
 class TokenBlacklistBase(BaseModel):
-    token: str
+    token_digest: bytes
     expires_at: datetime
 
 
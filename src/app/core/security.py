@@ -1,14 +1,23 @@
+import hashlib
+import uuid as uuid_pkg
 from datetime import UTC, datetime, timedelta
+from types import ModuleType
 from typing import Any, Literal
 
-import bcrypt
 from fastapi.security import OAuth2PasswordBearer
-from jose import JWTError, jwt
+from jose import JWTError
+from pydantic import BaseModel
+from sqlalchemy import exists, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from ..crud.crud_users import crud_users
+from ..crud.crud_users import crud_users, user_columns
+from ..models.user import User
 from .config import settings
 from .db.crud_token_blacklist import crud_token_blacklist
+from .db.database import release_connection
+from .db.revocation_cache import RevocationCache
+from .db.token_blacklist import TokenBlacklist
+from .password_pool import PasswordWorkerPool
 from .schemas import TokenBlacklistCreate, TokenData
 
 SECRET_KEY = settings.SECRET_KEY
@@ -18,16 +27,29 @@ REFRESH_TOKEN_EXPIRE_DAYS = settings.REFRESH_TOKEN_EXPIRE_DAYS
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/api/v1/login")
 
+password_pool = PasswordWorkerPool(
+    max_workers=settings.PASSWORD_HASH_WORKERS,
+    executor=settings.PASSWORD_HASH_EXECUTOR,
+)
+
+revocation_cache = RevocationCache(poll_interval=settings.TOKEN_BLACKLIST_POLL_SECONDS)
+
+
+def _jwt() -> ModuleType:
+    """`jose.jwt`, imported on first use: it loads every key backend, which is
+    about 25ms of startup."""
+    from jose import jwt
+
+    return jwt
+
 
 async def verify_password(plain_password: str, hashed_password: str) -> bool:
-    correct_password: bool = bcrypt.checkpw(
-        plain_password.encode(), hashed_password.encode()
-    )
+    correct_password: bool = await password_pool.verify(plain_password, hashed_password)
     return correct_password
 
 
-def get_password_hash(password: str) -> str:
-    hashed_password: str = bcrypt.hashpw(password.encode(), bcrypt.gensalt()).decode()
+async def async_get_password_hash(password: str) -> str:
+    hashed_password: str = await password_pool.hash(password)
     return hashed_password
 
 
@@ -43,6 +65,9 @@ async def authenticate_user(
             db=db, username=username_or_email, is_deleted=False
         )
 
+    # Don't hold a pooled connection through the bcrypt verification.
+    await release_connection(db)
+
     if not db_user:
         return False
 
@@ -62,8 +87,8 @@ async def create_access_token(
         expire = datetime.now(UTC).replace(tzinfo=None) + timedelta(
             minutes=ACCESS_TOKEN_EXPIRE_MINUTES
         )
-    to_encode.update({"exp": expire})
-    encoded_jwt: str = jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
+    to_encode.update({"exp": expire, "jti": uuid_pkg.uuid4().hex})
+    encoded_jwt: str = _jwt().encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
     return encoded_jwt
 
 
@@ -77,31 +102,90 @@ async def create_refresh_token(
         expire = datetime.now(UTC).replace(tzinfo=None) + timedelta(
             days=REFRESH_TOKEN_EXPIRE_DAYS
         )
-    to_encode.update({"exp": expire})
-    encoded_jwt: str = jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
+    to_encode.update({"exp": expire, "jti": uuid_pkg.uuid4().hex})
+    encoded_jwt: str = _jwt().encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
     return encoded_jwt
 
 
+def token_digest(token: str, payload: dict[str, Any]) -> bytes:
+    """Fixed-width key identifying a token in `token_blacklist`.
+
+    MD5 of the `jti` claim, or of the whole encoded token for tokens minted
+    before `jti` was added, which is also what the migration computes in SQL.
+    """
+    key: str = payload.get("jti") or token
+    return hashlib.md5(key.encode(), usedforsecurity=False).digest()
+
+
+def decode_token(token: str) -> dict[str, Any] | None:
+    try:
+        payload: dict[str, Any] = _jwt().decode(
+            token, SECRET_KEY, algorithms=[ALGORITHM]
+        )
+    except JWTError:
+        return None
+    return payload
+
+
+async def is_token_revoked(digest: bytes, db: AsyncSession) -> bool:
+    """Answer from the in-process cache once it is loaded; the database is only
+    queried while the cache is disabled or still loading."""
+    if revocation_cache.loaded:
+        return digest in revocation_cache
+    is_blacklisted: bool = await crud_token_blacklist.exists(db, token_digest=digest)
+    return is_blacklisted
+
+
 async def verify_token(token: str, db: AsyncSession) -> TokenData | None:
     """Verify a JWT token and return TokenData if valid."""
-    is_blacklisted = await crud_token_blacklist.exists(db, token=token)
-    if is_blacklisted:
+    payload = decode_token(token)
+    if payload is None:
         return None
 
-    try:
-        payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
-        username_or_email: str = payload.get("sub")
-        if username_or_email is None:
-            return None
-        return TokenData(username_or_email=username_or_email)
+    if await is_token_revoked(token_digest(token, payload), db):
+        return None
 
-    except JWTError:
+    username_or_email: str = payload.get("sub")
+    if username_or_email is None:
+        return None
+    return TokenData(username_or_email=username_or_email)
+
+
+async def get_user_unless_revoked(
+    username_or_email: str,
+    digest: bytes,
+    db: AsyncSession,
+    schema_to_select: type[BaseModel],
+) -> dict[str, Any] | None:
+    """Load a user and check the token's revocation in one statement.
+
+    Used on the authenticated path when revocations cannot be answered from
+    memory, so a request costs one round trip instead of two.
+    """
+    lookup = User.email if "@" in username_or_email else User.username
+    revoked = exists().where(TokenBlacklist.token_digest == digest).label("revoked")
+    stmt = select(*user_columns(schema_to_select), revoked).where(
+        lookup == username_or_email, User.is_deleted.is_(False)
+    )
+
+    row = (await db.execute(stmt)).mappings().first()
+    if row is None or row["revoked"]:
         return None
 
+    user = dict(row)
+    del user["revoked"]
+    return user
+
 
 async def blacklist_token(token: str, db: AsyncSession) -> None:
-    payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
-    expires_at = datetime.fromtimestamp(payload.get("exp"))
+    payload = _jwt().decode(token, SECRET_KEY, algorithms=[ALGORITHM])
+    # Stored as naive UTC, like every other timestamp the sweeper and cache compare.
+    expires_at = datetime.fromtimestamp(payload.get("exp"), UTC).replace(tzinfo=None)
+    digest = token_digest(token, payload)
     await crud_token_blacklist.create(
-        db, object=TokenBlacklistCreate(**{"token": token, "expires_at": expires_at})
+        db,
+        object=TokenBlacklistCreate(
+            **{"token_digest": digest, "expires_at": expires_at}
+        ),
     )
+    revocation_cache.add(digest, expires_at)
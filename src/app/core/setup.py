@@ -1,25 +1,41 @@
+import asyncio
+import hashlib
+import json
 from collections.abc import AsyncGenerator, Callable
 from contextlib import _AsyncGeneratorContextManager, asynccontextmanager
 from typing import Any
 
 import anyio
 import fastapi
-from fastapi import APIRouter, Depends, FastAPI
+from fastapi import APIRouter, Depends, FastAPI, Request
 from fastapi.openapi.docs import get_redoc_html, get_swagger_ui_html
 from fastapi.openapi.utils import get_openapi
+from fastapi.responses import Response
 from sqlalchemy import inspect
 
 from ..api.dependencies import get_current_superuser
 from ..models import *
 from .config import (
     AppSettings,
+    CryptSettings,
+    DatabaseBackendOption,
     DatabaseSettings,
     EnvironmentOption,
     EnvironmentSettings,
+    MetricsSettings,
     settings,
 )
 from .db.database import Base
 from .db.database import async_engine as engine
+from .db.database import dispose_engines, local_session
+from .db.token_blacklist_sweeper import run_token_blacklist_sweeper
+from .instrumentation import RequestMetricsMiddleware
+from .logger import logging
+from .metrics import CONTENT_TYPE_LATEST, registry
+from .responses import default_response_class
+from .security import password_pool, revocation_cache
+
+logger = logging.getLogger(__name__)
 
 
 # -------------- database --------------
@@ -40,6 +56,32 @@ async def create_tables_if_not_exist() -> None:
             await conn.run_sync(Base.metadata.create_all)
 
 
+async def load_revocation_cache() -> None:
+    try:
+        async with local_session() as db:
+            await revocation_cache.load(db)
+    except Exception:
+        logger.exception(
+            "Token revocation cache not loaded, falling back to the database"
+        )
+
+
+async def warm_revocation_cache() -> None:
+    """Load the revocation cache in the background, then keep it fresh.
+
+    Until the load finishes, revocation checks go to the database, as they do
+    when the cache is disabled.
+    """
+    await load_revocation_cache()
+    await revocation_cache.run(local_session)
+
+
+async def cancel_background_tasks(tasks: list[asyncio.Task]) -> None:
+    for task in tasks:
+        task.cancel()
+    await asyncio.gather(*tasks, return_exceptions=True)
+
+
 # -------------- application --------------
 async def set_threadpool_tokens(number_of_tokens: int = 100) -> None:
     limiter = anyio.to_thread.current_default_thread_limiter()
@@ -55,20 +97,91 @@ def lifespan_factory(
     @asynccontextmanager
     async def lifespan(app: FastAPI) -> AsyncGenerator:
         await set_threadpool_tokens()
+        background_tasks: list[asyncio.Task] = []
 
         if isinstance(settings, DatabaseSettings) and create_tables_on_start:
             await create_tables_if_not_exist()
 
+        if (
+            isinstance(settings, CryptSettings)
+            and settings.TOKEN_BLACKLIST_CACHE_ENABLED
+        ):
+            if isinstance(settings, AppSettings) and settings.FAST_BOOT:
+                background_tasks.append(asyncio.create_task(warm_revocation_cache()))
+            else:
+                await load_revocation_cache()
+                background_tasks.append(
+                    asyncio.create_task(revocation_cache.run(local_session))
+                )
+
+        if (
+            isinstance(settings, CryptSettings)
+            and settings.TOKEN_BLACKLIST_SWEEP_SECONDS > 0
+        ):
+            # Partitions are a PostgreSQL feature; other backends purge by DELETE.
+            partitioned = (
+                settings.TOKEN_BLACKLIST_PARTITIONED
+                and settings.DATABASE_BACKEND == DatabaseBackendOption.POSTGRES
+            )
+            background_tasks.append(
+                asyncio.create_task(
+                    run_token_blacklist_sweeper(
+                        local_session,
+                        interval=settings.TOKEN_BLACKLIST_SWEEP_SECONDS,
+                        batch_size=settings.TOKEN_BLACKLIST_SWEEP_BATCH_SIZE,
+                        partitioned=partitioned,
+                        days_ahead=settings.REFRESH_TOKEN_EXPIRE_DAYS + 2,
+                    )
+                )
+            )
+
         yield
 
+        await cancel_background_tasks(background_tasks)
+        password_pool.shutdown()
+        await dispose_engines()
+
     return lifespan
 
 
+class OpenAPIDocument:
+    """The application's OpenAPI schema, generated once and served as bytes.
+
+    The schema only depends on the registered routes, so it is built on the
+    first request and reused; clients sending the ETag back get a 304.
+    """
+
+    def __init__(self, application: FastAPI) -> None:
+        self.application = application
+        self._body: bytes | None = None
+        self._etag = ""
+
+    def _build(self) -> bytes:
+        schema = get_openapi(
+            title=self.application.title,
+            version=self.application.version,
+            routes=self.application.routes,
+        )
+        body = json.dumps(schema, separators=(",", ":")).encode()
+        self._etag = f'"{hashlib.sha256(body).hexdigest()[:32]}"'
+        return body
+
+    def response(self, request: Request) -> Response:
+        if self._body is None:
+            self._body = self._build()
+
+        headers = {"ETag": self._etag, "Cache-Control": "no-cache"}
+        if_none_match = request.headers.get("if-none-match", "")
+        if self._etag in (tag.strip() for tag in if_none_match.split(",")):
+            return Response(status_code=304, headers=headers)
+        return Response(self._body, media_type="application/json", headers=headers)
+
+
 # -------------- application --------------
 def create_application(
     router: APIRouter,
     settings: DatabaseSettings | AppSettings | EnvironmentSettings,
-    create_tables_on_start: bool = True,
+    create_tables_on_start: bool | None = None,
     **kwargs: Any,
 ) -> FastAPI:
     """Creates and configures a FastAPI application based on the provided settings.
@@ -85,14 +198,19 @@ def create_application(
         An instance representing the settings for configuring the FastAPI application.
         It determines the configuration applied:
 
-        - AppSettings: Configures basic app metadata like name, description, contact, and license info.
+        - AppSettings: Configures basic app metadata like name, description, contact, and license
+          info, and the default JSON response class. With `FAST_BOOT`, the token revocation cache
+          is loaded in the background instead of before the first request.
         - DatabaseSettings: Adds event handlers for initializing database tables during startup.
         - EnvironmentSettings: Conditionally sets documentation URLs and integrates custom routes for API documentation
           based on the environment type.
+        - MetricsSettings: Adds per-route request metrics and a Prometheus `/metrics` endpoint,
+          which requires a superuser outside the local environment.
 
-    create_tables_on_start : bool
+    create_tables_on_start : bool | None
         A flag to indicate whether to create database tables on application startup.
-        Defaults to True.
+        Defaults to True, or to False with `FAST_BOOT`, where the schema is trusted to be
+        migrated by Alembic and the table inspection at startup is skipped.
 
     **kwargs
         Additional keyword arguments passed directly to the FastAPI constructor.
@@ -116,15 +234,39 @@ def create_application(
             "license_info": {"name": settings.LICENSE_NAME},
         }
         kwargs.update(to_update)
+        kwargs.setdefault(
+            "default_response_class",
+            default_response_class(settings.FAST_JSON_RESPONSES),
+        )
 
     if isinstance(settings, EnvironmentSettings):
         kwargs.update({"docs_url": None, "redoc_url": None, "openapi_url": None})
 
+    if create_tables_on_start is None:
+        create_tables_on_start = not (
+            isinstance(settings, AppSettings) and settings.FAST_BOOT
+        )
     lifespan = lifespan_factory(settings, create_tables_on_start=create_tables_on_start)
 
     application = FastAPI(lifespan=lifespan, **kwargs)
     application.include_router(router)
 
+    if isinstance(settings, MetricsSettings) and settings.METRICS_ENABLED:
+        application.add_middleware(RequestMetricsMiddleware)
+
+        metrics_router = APIRouter()
+        if (
+            isinstance(settings, EnvironmentSettings)
+            and settings.ENVIRONMENT != EnvironmentOption.LOCAL
+        ):
+            metrics_router = APIRouter(dependencies=[Depends(get_current_superuser)])
+
+        @metrics_router.get("/metrics", include_in_schema=False)
+        async def metrics() -> Response:
+            return Response(registry.render(), media_type=CONTENT_TYPE_LATEST)
+
+        application.include_router(metrics_router)
+
     if isinstance(settings, EnvironmentSettings):
         if settings.ENVIRONMENT != EnvironmentOption.PRODUCTION:
             docs_router = APIRouter()
@@ -139,14 +281,11 @@ def create_application(
             async def get_redoc_documentation() -> fastapi.responses.HTMLResponse:
                 return get_redoc_html(openapi_url="/openapi.json", title="docs")
 
+            openapi_document = OpenAPIDocument(application)
+
             @docs_router.get("/openapi.json", include_in_schema=False)
-            async def openapi() -> dict[str, Any]:
-                out: dict = get_openapi(
-                    title=application.title,
-                    version=application.version,
-                    routes=application.routes,
-                )
-                return out
+            async def openapi(request: Request) -> Response:
+                return openapi_document.response(request)
 
             application.include_router(docs_router)
 
@@ -1,4 +1,12 @@
+from datetime import UTC, datetime
+from typing import Any
+
 from fastcrud import FastCRUD
+from pydantic import BaseModel
+from sqlalchemy import or_, select, update
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from ..models.user import User
 from ..schemas.user import (
@@ -12,3 +20,147 @@ CRUDUser = FastCRUD[
     User, UserCreateInternal, UserUpdate, UserUpdateInternal, UserDelete
 ]
 crud_users = CRUDUser(User)
+
+
+def user_columns(schema: type[BaseModel]) -> list[Any]:
+    """The `user` columns named by the schema's fields, for hand-written statements."""
+    return [User.__table__.c[name] for name in schema.model_fields]
+
+
+def _insert(db: AsyncSession, table: type[User]) -> Any:
+    """INSERT construct of the session's dialect, for ON CONFLICT support."""
+    if db.bind.dialect.name == "sqlite":
+        return sqlite.insert(table)
+    return postgresql.insert(table)
+
+
+def _insert_values(object: UserCreateInternal) -> dict[str, Any]:
+    # Build through the mapped class so dataclass defaults (uuid, created_at...)
+    # are applied exactly as for an ORM insert.
+    db_user = User(**object.model_dump())
+    return {
+        column.key: getattr(db_user, column.key)
+        for column in User.__table__.columns
+        if column.key != "id"
+    }
+
+
+async def create_user_unless_taken(
+    db: AsyncSession, object: UserCreateInternal, schema_to_select: type[BaseModel]
+) -> dict[str, Any] | None:
+    """Insert a user in one statement, relying on the unique email and username
+    indexes instead of checking first.
+
+    Returns the created row projected to `schema_to_select`, or None when the
+    email or username is already taken.
+    """
+    values = _insert_values(object)
+    stmt = (
+        _insert(db, User)
+        .values(**values)
+        .on_conflict_do_nothing()
+        .returning(*user_columns(schema_to_select))
+    )
+
+    result = await db.execute(stmt)
+    row = result.mappings().first()
+    await db.commit()
+    return dict(row) if row is not None else None
+
+
+async def create_users_unless_taken(
+    db: AsyncSession, objects: list[UserCreateInternal]
+) -> set[str]:
+    """Insert many users with one multi-row INSERT ... ON CONFLICT DO NOTHING.
+
+    Returns the usernames that were created; rows whose email or username is
+    taken, including by an earlier row of the same batch, are skipped.
+    """
+    if not objects:
+        return set()
+
+    stmt = (
+        _insert(db, User)
+        .values([_insert_values(object) for object in objects])
+        .on_conflict_do_nothing()
+        .returning(User.username)
+    )
+    result = await db.execute(stmt)
+    created = set(result.scalars().all())
+    await db.commit()
+    return created
+
+
+async def get_taken_fields(db: AsyncSession, email: str, username: str) -> set[str]:
+    """Which of `email` and `username` already belong to a user."""
+    result = await db.execute(
+        select(User.email, User.username).where(
+            or_(User.email == email, User.username == username)
+        )
+    )
+    taken: set[str] = set()
+    for row in result.all():
+        if row.email == email:
+            taken.add("email")
+        if row.username == username:
+            taken.add("username")
+    return taken
+
+
+async def update_user_returning(
+    db: AsyncSession,
+    user_id: int,
+    username: str,
+    object: UserUpdate,
+    schema_to_select: type[BaseModel],
+) -> dict[str, Any] | None:
+    """Update the user identified by both `user_id` and `username` in one statement.
+
+    Matching on both puts the ownership check in the WHERE clause; uniqueness
+    is left to the indexes, so an IntegrityError is raised (after rolling back)
+    when the new email or username is taken. Returns the updated row projected
+    to `schema_to_select`, or None when no row matched.
+    """
+    values = object.model_dump(exclude_unset=True)
+    values["updated_at"] = datetime.now(UTC)
+    stmt = (
+        update(User)
+        .where(User.id == user_id, User.username == username)
+        .values(**values)
+        .returning(*user_columns(schema_to_select))
+    )
+
+    try:
+        result = await db.execute(stmt)
+    except IntegrityError:
+        await db.rollback()
+        raise
+
+    row = result.mappings().first()
+    await db.commit()
+    return dict(row) if row is not None else None
+
+
+# Unique indexes on `user` by name, as created by create_all and the migrations.
+UNIQUE_USER_INDEXES = {"ix_user_username": "username", "ix_user_email": "email"}
+SQLITE_UNIQUE_FAILED = "UNIQUE constraint failed: "
+
+
+def taken_field(error: IntegrityError) -> str | None:
+    """Name the unique user field a constraint violation was raised for.
+
+    Returns None for any other integrity error, which callers should re-raise.
+    """
+    # asyncpg's UniqueViolationError carries the violated index's name.
+    constraint_name = getattr(error.orig.__cause__, "constraint_name", None)
+    if constraint_name is not None:
+        return UNIQUE_USER_INDEXES.get(constraint_name)
+
+    # SQLite only names the columns: "UNIQUE constraint failed: user.email".
+    message = str(error.orig)
+    if message.startswith(SQLITE_UNIQUE_FAILED):
+        columns = message.removeprefix(SQLITE_UNIQUE_FAILED).split(", ")
+        for field in ("username", "email"):
+            if f"{User.__tablename__}.{field}" in columns:
+                return field
+    return None
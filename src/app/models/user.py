@@ -28,7 +28,7 @@ class User(Base):
         String, default="https://profileimageurl.com"
     )
     uuid: Mapped[uuid_pkg.UUID] = mapped_column(
-        default_factory=uuid_pkg.uuid4, primary_key=True, unique=True
+        default_factory=uuid_pkg.uuid4, unique=True
     )
     created_at: Mapped[datetime] = mapped_column(
         DateTime(timezone=True), default_factory=lambda: datetime.now(UTC)
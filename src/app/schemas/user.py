@@ -37,6 +37,10 @@ class UserRead(BaseModel):
     profile_image_url: str
 
 
+class UserReadInternal(UserRead):
+    is_superuser: bool
+
+
 class UserCreate(UserBase):
     model_config = ConfigDict(extra="forbid")
 
@@ -96,3 +100,14 @@ class UserDelete(BaseModel):
 
 class UserRestoreDeleted(BaseModel):
     is_deleted: bool
+
+
+class UserImportError(BaseModel):
+    row: int
+    detail: str
+
+
+class UserImportReport(BaseModel):
+    imported: int
+    failed: int
+    errors: list[UserImportError]
@@ -0,0 +1,122 @@
+"""Report where application startup time goes.
+
+Imports the app in a fresh interpreter under `-X importtime` and sums the
+import time per top-level package, then runs the lifespan startup and shutdown
+against the configured database and times them. Run it from the directory you
+start the server from, with the same environment:
+
+    python -m app.startup_profile
+    FAST_BOOT=true python -m app.startup_profile --top 10
+"""
+
+import argparse
+import asyncio
+import subprocess
+import sys
+import time
+from collections import defaultdict
+from typing import NamedTuple
+
+APP_PACKAGE = __package__ or "app"
+
+
+class ImportTiming(NamedTuple):
+    module: str
+    self_us: int
+    cumulative_us: int
+    depth: int
+
+
+def parse_importtime(output: str) -> list[ImportTiming]:
+    """Parse the `import time: self | cumulative | module` lines of `-X importtime`."""
+    timings = []
+    for line in output.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        fields = line[len("import time:") :].split("|")
+        if len(fields) != 3 or not fields[0].strip().isdigit():
+            continue  # the header line
+        name = fields[2].rstrip()
+        module = name.lstrip()
+        timings.append(
+            ImportTiming(
+                module=module,
+                self_us=int(fields[0]),
+                cumulative_us=int(fields[1]),
+                depth=(len(name) - len(module) - 1) // 2,
+            )
+        )
+    return timings
+
+
+def group_by_package(
+    timings: list[ImportTiming], app_package: str = APP_PACKAGE
+) -> dict[str, int]:
+    """Self time per top-level package; the app's own modules are split per subpackage."""
+    app_depth = app_package.count(".") + 2
+    totals: dict[str, int] = defaultdict(int)
+    for timing in timings:
+        if timing.module.startswith(f"{app_package}."):
+            key = ".".join(timing.module.split(".")[:app_depth])
+        else:
+            key = timing.module.split(".")[0]
+        totals[key] += timing.self_us
+    return dict(sorted(totals.items(), key=lambda item: item[1], reverse=True))
+
+
+def profile_imports(module: str) -> list[ImportTiming]:
+    completed = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    return parse_importtime(completed.stderr)
+
+
+async def profile_lifespan() -> tuple[float, float, float]:
+    started = time.perf_counter()
+    from .main import app
+
+    imported = time.perf_counter()
+    lifespan = app.router.lifespan_context(app)
+    await lifespan.__aenter__()
+    ready = time.perf_counter()
+    await lifespan.__aexit__(None, None, None)
+    stopped = time.perf_counter()
+    return imported - started, ready - imported, stopped - ready
+
+
+def print_imports(timings: list[ImportTiming], top: int) -> None:
+    total_us = sum(timing.cumulative_us for timing in timings if timing.depth == 0)
+    print(f"import {APP_PACKAGE}.main: {total_us / 1000:.1f} ms (fresh interpreter)")
+    print(f"\n{'package':<32}{'self ms':>10}")
+    for package, self_us in list(group_by_package(timings).items())[:top]:
+        print(f"{package:<32}{self_us / 1000:>10.1f}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--top", type=int, default=15, help="packages to list")
+    parser.add_argument(
+        "--no-lifespan",
+        action="store_true",
+        help="only profile imports, without connecting to the database",
+    )
+    args = parser.parse_args()
+
+    print_imports(profile_imports(f"{APP_PACKAGE}.main"), args.top)
+    if args.no_lifespan:
+        return
+
+    from .core.config import settings
+
+    import_s, startup_s, shutdown_s = asyncio.run(profile_lifespan())
+    print(f"\nFAST_BOOT={settings.FAST_BOOT}")
+    print(f"{'import (this process)':<32}{import_s * 1000:>10.1f} ms")
+    print(f"{'lifespan startup':<32}{startup_s * 1000:>10.1f} ms")
+    print(f"{'lifespan shutdown':<32}{shutdown_s * 1000:>10.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -28,7 +28,7 @@ def load_agents_from_config(config_file):
         # Get the directory of the current script
         current_dir = os.path.dirname(os.path.abspath(__file__))
 
-        logger.info(f"Loading config from: {config_file}")
+        logger.info("Loading config from: %s", config_file)
         with open(config_file) as file:
             config = yaml.safe_load(file)
 
@@ -39,12 +39,12 @@ def load_agents_from_config(config_file):
                 os.path.join(current_dir, agent_data["image_path"])
             )
             agent_data["image_path"] = image_path
-            logger.info(f"Agent: {agent_data['name']}, Image path: {image_path}")
+            logger.info("Agent: %s, Image path: %s", agent_data["name"], image_path)
             agents.append(Agent(**agent_data))
 
         return agents
     except Exception as e:
-        logger.error(f"Error loading agents from config: {str(e)}")
+        logger.error("Error loading agents from config: %s", e)
         return []
 
 
@@ -53,7 +53,7 @@ def load_image(image_path):
     try:
         return Image.open(image_path)
     except Exception as e:
-        logger.error(f"Error loading image {image_path}: {str(e)}")
+        logger.error("Error loading image %s: %s", image_path, e)
         return None
 
 
@@ -66,16 +66,16 @@ def call_login_user():
 
     # Ensure both username and password are provided
     if username and password:
-        logger.info(f"Login attempt for username: {username}")
+        logger.info("Login attempt for username: %s", username)
         result = login_user(username, password)
         if result:
             # Store access token in session state if login is successful
             st.session_state["access_token"] = result["access_token"]
             st.success("Logged in successfully!")
-            logger.info(f"User {username} logged in successfully")
+            logger.info("User %s logged in successfully", username)
         else:
             st.error("Invalid username or password")
-            logger.error(f"Login failed for user {username}")
+            logger.error("Login failed for user %s", username)
 
 
 # Show login form modal
@@ -118,13 +118,13 @@ def call_register_user():
 
     # Check that all fields are filled and passwords match
     if username and email and full_name and password and password == password_confirm:
-        logger.info(f"Registration form submitted for username: {username}")
+        logger.info("Registration form submitted for username: %s", username)
         if register_user(username, email, full_name, password, password_confirm):
             st.success("Registered successfully! Please login.")
-            logger.info(f"User {username} registered successfully")
+            logger.info("User %s registered successfully", username)
         else:
             st.error("Registration failed. Please try again.")
-            logger.error(f"Registration failed for user {username}")
+            logger.error("Registration failed for user %s", username)
     else:
         st.error("Please fill in all fields correctly.")
 
@@ -243,7 +243,9 @@ def main():
 
         # Log the loaded agents
         for agent in agents:
-            logger.info(f"Loaded agent: {agent.name}, Image path: {agent.image_path}")
+            logger.info(
+                "Loaded agent: %s, Image path: %s", agent.name, agent.image_path
+            )
 
         # Set current agent in session state if not set
         if "current_agent" not in st.session_state:
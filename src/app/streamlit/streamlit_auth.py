@@ -17,17 +17,22 @@ API_BASE_URL = settings.API_BASE_URL
 
 
 def login_user(username: str, password: str) -> Optional[dict]:
-    logger.info(f"Attempting to log in user: {username} on {API_BASE_URL}/api/v1/login")
+    logger.info(
+        "Attempting to log in user: %s on %s/api/v1/login", username, API_BASE_URL
+    )
     response = requests.post(
         f"{API_BASE_URL}/api/v1/login",
         data={"username": username, "password": password},
     )
     if response.status_code == 201:
-        logger.info(f"User {username} logged in successfully")
+        logger.info("User %s logged in successfully", username)
         return response.json()
     else:
         logger.error(
-            f"Login failed for user {username}. Status code: {response.status_code}, Response: {response.text}"
+            "Login failed for user %s. Status code: %s, Response: %s",
+            username,
+            response.status_code,
+            response.text,
         )
     return None
 
@@ -36,10 +41,10 @@ def register_user(
     username: str, email: str, full_name: str, password: str, password_confirm: str
 ) -> bool:
     logger.info(
-        f"Attempting to register user: {username} on {API_BASE_URL}/api/v1/user"
+        "Attempting to register user: %s on %s/api/v1/user", username, API_BASE_URL
     )
     if password != password_confirm:
-        logger.error(f"Password confirmation failed for user {username}")
+        logger.error("Password confirmation failed for user %s", username)
         return False
     try:
         response = requests.post(
@@ -51,19 +56,22 @@ def register_user(
                 "password": password,
             },
         )
-        logger.info(f"Registration response status code: {response.status_code}")
-        logger.info(f"Registration response content: {response.text}")
+        logger.info("Registration response status code: %s", response.status_code)
+        logger.info("Registration response content: %s", response.text)
 
         if response.status_code == 201:
-            logger.info(f"User {username} registered successfully")
+            logger.info("User %s registered successfully", username)
             return True
         else:
             logger.error(
-                f"Registration failed for user {username}. Status code: {response.status_code}, Response: {response.text}"
+                "Registration failed for user %s. Status code: %s, Response: %s",
+                username,
+                response.status_code,
+                response.text,
             )
             return False
     except requests.RequestException as e:
-        logger.error(f"Error during registration request: {str(e)}")
+        logger.error("Error during registration request: %s", e)
         return False
 
 
@@ -72,7 +80,7 @@ def is_logged_in() -> bool:
 
 
 def logout_user():
-    logger.info(f"Attempting to log out user on {API_BASE_URL}/api/v1/logout")
+    logger.info("Attempting to log out user on %s/api/v1/logout", API_BASE_URL)
     try:
         access_token = st.session_state.get("access_token")
         if not access_token:
@@ -90,11 +98,13 @@ def logout_user():
             return True
         else:
             logger.error(
-                f"Logout failed. Status code: {response.status_code}, Response: {response.text}"
+                "Logout failed. Status code: %s, Response: %s",
+                response.status_code,
+                response.text,
             )
             return False
     except requests.RequestException as e:
-        logger.error(f"Error during logout request: {str(e)}")
+        logger.error("Error during logout request: %s", e)
         return False
 
 
@@ -138,14 +148,14 @@ def call_register_user():
     password = st.session_state.register_password
     password_confirm = st.session_state.register_password_confirm
 
-    logger.info(f"Registration form submitted for username: {username}")
+    logger.info("Registration form submitted for username: %s", username)
     if register_user(username, email, full_name, password, password_confirm):
         st.success("Registered successfully! Please login.")
-        logger.info(f"User {username} registered successfully")
+        logger.info("User %s registered successfully", username)
         st.experimental_rerun()
     else:
         st.error("Registration failed. Please try again.")
-        logger.error(f"Registration failed for user {username}")
+        logger.error("Registration failed for user %s", username)
 
 
 def load_image_as_base64(image_path: str) -> str:
@@ -153,5 +163,5 @@ def load_image_as_base64(image_path: str) -> str:
         with open(image_path, "rb") as img_file:
             return base64.b64encode(img_file.read()).decode()
     except Exception as e:
-        logger.error(f"Error loading image {image_path}: {str(e)}")
+        logger.error("Error loading image %s: %s", image_path, e)
         return ""
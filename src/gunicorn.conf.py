@@ -0,0 +1,23 @@
+"""Gunicorn settings for serving the API with uvicorn workers.
+
+The app is imported once in the master process and the workers are forked from
+it, so they share its memory pages until they write to them. Each worker then
+gets its own database pools, logging thread and password pool (see the
+`os.register_at_fork` hooks), runs the lifespan, and disposes its engine on
+shutdown. Run from `src`:
+
+    gunicorn app.main:app
+"""
+
+from app.core.config import settings
+
+wsgi_app = "app.main:app"
+worker_class = "uvicorn.workers.UvicornWorker"
+bind = f"{settings.SERVER_HOST}:{settings.SERVER_PORT}"
+workers = settings.WEB_CONCURRENCY
+preload_app = settings.SERVER_PRELOAD
+timeout = settings.SERVER_TIMEOUT
+graceful_timeout = settings.SERVER_GRACEFUL_TIMEOUT
+keepalive = settings.SERVER_KEEPALIVE
+max_requests = settings.SERVER_MAX_REQUESTS
+max_requests_jitter = settings.SERVER_MAX_REQUESTS_JITTER
@@ -20,6 +20,9 @@ depends_on: Union[str, Sequence[str], None] = None
 
 def upgrade() -> None:
     # ### commands auto generated by Alembic - please adjust! ###
+    # A fresh database has no token_blacklist yet.
+    if 'token_blacklist' not in sa.inspect(op.get_bind()).get_table_names():
+        return
     op.drop_index('ix_token_blacklist_token', table_name='token_blacklist')
     op.drop_table('token_blacklist')
     # ### end Alembic commands ###
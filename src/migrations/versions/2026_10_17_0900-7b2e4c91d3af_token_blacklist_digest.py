@@ -0,0 +1,74 @@
+"""Key token_blacklist by a 16-byte token digest
+
+Revision ID: 7b2e4c91d3af
+Revises: 5cd47b57945b
+Create Date: 2026-10-17 09:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "7b2e4c91d3af"
+down_revision: Union[str, None] = "5cd47b57945b"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def _create_digest_table() -> None:
+    op.create_table(
+        "token_blacklist",
+        sa.Column("id", sa.Integer(), autoincrement=True, nullable=False),
+        sa.Column("token_digest", sa.LargeBinary(length=16), nullable=False),
+        sa.Column("expires_at", sa.DateTime(), nullable=False),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index(
+        "ix_token_blacklist_token_digest",
+        "token_blacklist",
+        ["token_digest"],
+        unique=True,
+    )
+
+
+def upgrade() -> None:
+    existing_tables = sa.inspect(op.get_bind()).get_table_names()
+    if "token_blacklist" not in existing_tables:
+        _create_digest_table()
+        return
+
+    # Tokens already on the blacklist carry no jti claim, so their digest is
+    # the MD5 of the whole encoded token (see core.security.token_digest).
+    op.add_column(
+        "token_blacklist",
+        sa.Column("token_digest", sa.LargeBinary(length=16), nullable=True),
+    )
+    op.execute("UPDATE token_blacklist SET token_digest = decode(md5(token), 'hex')")
+    op.alter_column("token_blacklist", "token_digest", nullable=False)
+    op.drop_index("ix_token_blacklist_token", table_name="token_blacklist")
+    op.drop_column("token_blacklist", "token")
+    op.create_index(
+        "ix_token_blacklist_token_digest",
+        "token_blacklist",
+        ["token_digest"],
+        unique=True,
+    )
+
+
+def downgrade() -> None:
+    # Digests cannot be turned back into tokens, so revocations are discarded.
+    op.drop_index("ix_token_blacklist_token_digest", table_name="token_blacklist")
+    op.drop_table("token_blacklist")
+    op.create_table(
+        "token_blacklist",
+        sa.Column("id", sa.Integer(), autoincrement=True, nullable=False),
+        sa.Column("token", sa.String(), nullable=False),
+        sa.Column("expires_at", sa.DateTime(), nullable=False),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index(
+        "ix_token_blacklist_token", "token_blacklist", ["token"], unique=True
+    )
@@ -0,0 +1,37 @@
+"""Key user by id alone, keeping uuid unique
+
+Revision ID: c4a81f0e6b27
+Revises: 7b2e4c91d3af
+Create Date: 2026-10-17 12:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "c4a81f0e6b27"
+down_revision: Union[str, None] = "7b2e4c91d3af"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # The table is created by the app on startup, so it may not exist yet.
+    if "user" not in sa.inspect(op.get_bind()).get_table_names():
+        return
+
+    # The (id, uuid) composite key kept `id` from being an autoincrementing
+    # rowid on SQLite; `uuid` already has its own unique constraint.
+    op.drop_constraint("user_pkey", "user", type_="primary")
+    op.create_primary_key("user_pkey", "user", ["id"])
+
+
+def downgrade() -> None:
+    if "user" not in sa.inspect(op.get_bind()).get_table_names():
+        return
+
+    op.drop_constraint("user_pkey", "user", type_="primary")
+    op.create_primary_key("user_pkey", "user", ["id", "uuid"])
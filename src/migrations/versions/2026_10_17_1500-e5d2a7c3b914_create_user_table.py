@@ -0,0 +1,52 @@
+"""Create the user table
+
+Revision ID: e5d2a7c3b914
+Revises: c4a81f0e6b27
+Create Date: 2026-10-17 15:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "e5d2a7c3b914"
+down_revision: Union[str, None] = "c4a81f0e6b27"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Until now the app created this table on startup, so databases that have
+    # run the app already have it.
+    if "user" in sa.inspect(op.get_bind()).get_table_names():
+        return
+
+    op.create_table(
+        "user",
+        sa.Column("id", sa.Integer(), autoincrement=True, nullable=False),
+        sa.Column("name", sa.String(length=30), nullable=False),
+        sa.Column("username", sa.String(length=20), nullable=False),
+        sa.Column("email", sa.String(length=50), nullable=False),
+        sa.Column("hashed_password", sa.String(), nullable=False),
+        sa.Column("profile_image_url", sa.String(), nullable=False),
+        sa.Column("uuid", sa.Uuid(), nullable=False),
+        sa.Column("created_at", sa.DateTime(timezone=True), nullable=False),
+        sa.Column("updated_at", sa.DateTime(timezone=True), nullable=True),
+        sa.Column("deleted_at", sa.DateTime(timezone=True), nullable=True),
+        sa.Column("is_deleted", sa.Boolean(), nullable=False),
+        sa.Column("is_superuser", sa.Boolean(), nullable=False),
+        sa.PrimaryKeyConstraint("id", name="user_pkey"),
+        sa.UniqueConstraint("uuid", name="user_uuid_key"),
+    )
+    op.create_index("ix_user_email", "user", ["email"], unique=True)
+    op.create_index("ix_user_username", "user", ["username"], unique=True)
+    op.create_index("ix_user_is_deleted", "user", ["is_deleted"], unique=False)
+
+
+def downgrade() -> None:
+    # Earlier revisions leave the table to the app, which may already hold
+    # users in it, so it is kept.
+    pass
@@ -18,7 +18,7 @@ from sqlalchemy.dialects.postgresql import UUID
 
 from ..app.core.config import settings
 from ..app.core.db.database import AsyncSession, async_engine, local_session
-from ..app.core.security import get_password_hash
+from ..app.core.security import async_get_password_hash
 from ..app.models.user import User
 
 logging.basicConfig(level=logging.INFO)
@@ -30,7 +30,7 @@ async def create_first_user(session: AsyncSession) -> None:
         name = settings.ADMIN_NAME
         email = settings.ADMIN_EMAIL
         username = settings.ADMIN_USERNAME
-        hashed_password = get_password_hash(settings.ADMIN_PASSWORD)
+        hashed_password = await async_get_password_hash(settings.ADMIN_PASSWORD)
 
         query = select(User).filter_by(email=email)
         result = await session.execute(query)
@@ -0,0 +1,26 @@
+import asyncio
+import logging
+
+from ..app.core.config import settings
+from ..app.core.db.database import async_engine
+from ..app.core.db.token_blacklist_sweeper import partition_token_blacklist
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+async def main():
+    async with async_engine.begin() as conn:
+        await partition_token_blacklist(
+            conn, days_ahead=settings.REFRESH_TOKEN_EXPIRE_DAYS + 2
+        )
+
+    logger.info(
+        "token_blacklist is now partitioned by expires_at day, "
+        "set TOKEN_BLACKLIST_PARTITIONED=true to let the sweeper drop old partitions."
+    )
+
+
+if __name__ == "__main__":
+    loop = asyncio.get_event_loop()
+    loop.run_until_complete(main())
@@ -1,39 +1,108 @@
-from collections.abc import Callable, Generator
+import os
+from collections.abc import AsyncGenerator, Callable, Generator
 from typing import Any
 
-import pytest
-from faker import Faker
-from fastapi.testclient import TestClient
-from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker
-from sqlalchemy.orm.session import Session
+# Settings are read at import time, so configure the test run before the app is
+# imported. Each pytest-xdist worker gets its own PostgreSQL schema, or its own
+# SQLite file.
+WORKER_ID = os.environ.get("PYTEST_XDIST_WORKER", "main")
+os.environ["POSTGRES_SCHEMA"] = f"test_{WORKER_ID}"
+if os.environ.get("SQLITE_URI", ":memory:") != ":memory:" and WORKER_ID != "main":
+    os.environ["SQLITE_URI"] = f"{os.environ['SQLITE_URI']}.{WORKER_ID}"
+# Background pollers would run outside the per-test transactions.
+os.environ["TOKEN_BLACKLIST_POLL_SECONDS"] = "3600"
+os.environ["TOKEN_BLACKLIST_SWEEP_SECONDS"] = "0"
 
-from src.app.core.config import settings
-from src.app.main import app
+import httpx  # noqa: E402
+import pytest  # noqa: E402
+from faker import Faker  # noqa: E402
+from sqlalchemy import text  # noqa: E402
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncSession  # noqa: E402
 
-DATABASE_URI = settings.POSTGRES_URI
-DATABASE_PREFIX = settings.POSTGRES_SYNC_PREFIX
+from src.app.api.dependencies import user_cache  # noqa: E402
+from src.app.api.v1 import login  # noqa: E402
+from src.app.api.v1.users import user_count_cache  # noqa: E402
+from src.app.core.config import settings  # noqa: E402
+from src.app.core.db.database import Base, async_engine, async_get_db  # noqa: E402
+from src.app.main import app  # noqa: E402
 
-sync_engine = create_engine(DATABASE_PREFIX + DATABASE_URI)
-local_session = sessionmaker(autocommit=False, autoflush=False, bind=sync_engine)
+fake = Faker()
 
 
-fake = Faker()
+async def reset_test_database() -> None:
+    """Start every run from empty tables matching the current models."""
+    async with async_engine.begin() as conn:
+        if async_engine.dialect.name != "postgresql":
+            await conn.run_sync(Base.metadata.drop_all)
+        elif (settings.POSTGRES_SCHEMA or "").startswith("test_"):
+            schema = settings.POSTGRES_SCHEMA
+            await conn.execute(text(f'DROP SCHEMA IF EXISTS "{schema}" CASCADE'))
+            await conn.execute(text(f'CREATE SCHEMA "{schema}"'))
+
+
+def test_session(connection: AsyncConnection) -> AsyncSession:
+    # Commits release a SAVEPOINT inside the test's transaction instead of
+    # committing it, so the test's rollback still undoes them.
+    return AsyncSession(
+        bind=connection,
+        expire_on_commit=False,
+        join_transaction_mode="create_savepoint",
+    )
 
 
 @pytest.fixture(scope="session")
-def client() -> Generator[TestClient, Any, None]:
-    with TestClient(app) as _client:
-        yield _client
-    app.dependency_overrides = {}
-    sync_engine.dispose()
+def anyio_backend() -> str:
+    return "asyncio"
+
+
+@pytest.fixture(scope="session")
+async def application(anyio_backend: str) -> AsyncGenerator[Any, None]:
+    await reset_test_database()
+    async with app.router.lifespan_context(app):
+        yield app
+    await async_engine.dispose()
+
+
+@pytest.fixture
+async def connection(application: Any) -> AsyncGenerator[AsyncConnection, None]:
+    async with async_engine.connect() as conn:
+        transaction = await conn.begin()
+        yield conn
+        await transaction.rollback()
 
 
 @pytest.fixture
-def db() -> Generator[Session, Any, None]:
-    session = local_session()
+async def db(connection: AsyncConnection) -> AsyncGenerator[AsyncSession, None]:
+    session = test_session(connection)
     yield session
-    session.close()
+    await session.close()
+
+
+@pytest.fixture
+async def client(
+    application: Any, connection: AsyncConnection
+) -> AsyncGenerator[httpx.AsyncClient, None]:
+    async def get_test_db() -> AsyncGenerator[AsyncSession, None]:
+        async with test_session(connection) as session:
+            yield session
+
+    application.dependency_overrides[async_get_db] = get_test_db
+    transport = httpx.ASGITransport(app=application)
+    async with httpx.AsyncClient(
+        transport=transport, base_url="http://testserver"
+    ) as _client:
+        yield _client
+
+
+@pytest.fixture(autouse=True)
+def reset_app_state() -> Generator[None, Any, None]:
+    yield
+    app.dependency_overrides = {}
+    # Rows are rolled back after each test; don't let cached copies outlive them.
+    user_cache.clear()
+    user_count_cache.clear()
+    login.login_ip_limiter.clear()
+    login.login_username_limiter.clear()
 
 
 def override_dependency(dependency: Callable[..., Any], mocked_response: Any) -> None:
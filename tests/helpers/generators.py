@@ -1,25 +1,27 @@
 import uuid as uuid_pkg
 
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from src.app import models
-from src.app.core.security import get_password_hash
+from src.app.core.security import async_get_password_hash
 from tests.conftest import fake
 
 
-def create_user(db: Session, is_super_user: bool = False) -> models.User:
+async def create_user(
+    db: AsyncSession, is_super_user: bool = False, password: str | None = None
+) -> models.User:
     _user = models.User(
         name=fake.name(),
         username=fake.user_name(),
         email=fake.email(),
-        hashed_password=get_password_hash(fake.password()),
+        hashed_password=await async_get_password_hash(password or fake.password()),
         profile_image_url=fake.image_url(),
         uuid=uuid_pkg.uuid4(),
         is_superuser=is_super_user,
     )
 
     db.add(_user)
-    db.commit()
-    db.refresh(_user)
+    await db.commit()
+    await db.refresh(_user)
 
     return _user
@@ -0,0 +1,76 @@
+from typing import Any
+
+import pytest
+from fastapi import status
+from httpx import AsyncClient
+from pytest_mock import MockerFixture
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.app.api.dependencies import get_current_user
+from src.app.core.db.database import (
+    ReplicaMonitor,
+    async_engine,
+    pool_limits,
+    release_connection,
+)
+from tests.conftest import override_dependency
+
+from .helpers import generators, mocks
+
+pytestmark = pytest.mark.anyio
+
+
+async def test_read_db_pool_status(db: AsyncSession, client: AsyncClient) -> None:
+    super_user = await generators.create_user(db, is_super_user=True)
+    override_dependency(get_current_user, mocks.get_current_user(super_user))
+
+    response = await client.get("/api/v1/health/db-pool")
+    assert response.status_code == status.HTTP_200_OK
+
+    pool = response.json()
+    assert pool["pool_size"] >= 1
+    assert pool["checkouts"] >= 1
+    assert pool["checked_out"] <= pool["pool_size"] + pool["max_overflow"]
+
+
+async def test_read_db_pool_status_requires_superuser(
+    db: AsyncSession, client: AsyncClient
+) -> None:
+    user = await generators.create_user(db)
+    override_dependency(get_current_user, mocks.get_current_user(user))
+
+    response = await client.get("/api/v1/health/db-pool")
+    assert response.status_code == status.HTTP_403_FORBIDDEN
+
+
+async def test_read_endpoints_release_connection_before_response(
+    db: AsyncSession, client: AsyncClient, mocker: MockerFixture
+) -> None:
+    user = await generators.create_user(db)
+    release = mocker.patch(
+        "src.app.api.v1.users.release_connection", wraps=release_connection
+    )
+
+    response = await client.get(f"/api/v1/user/{user.username}")
+    assert response.status_code == status.HTTP_200_OK
+
+    release.assert_awaited_once()
+    assert not release.await_args.args[0].in_transaction()
+
+
+def test_pool_limits_split_connection_budget_across_workers() -> None:
+    assert pool_limits(5, 10, None, workers=8) == (5, 10)
+    assert pool_limits(5, 10, 100, workers=4) == (5, 10)
+    assert pool_limits(5, 10, 40, workers=4) == (5, 5)
+    assert pool_limits(5, 10, 12, workers=4) == (3, 0)
+    assert pool_limits(5, 10, 2, workers=4) == (1, 0)
+
+
+async def test_replica_monitor_reports_no_lag_when_caught_up(application: Any) -> None:
+    if async_engine.dialect.name != "postgresql":
+        pytest.skip("replication lag is a PostgreSQL check")
+    # A server that is not replaying WAL reports no lag, like a caught-up replica.
+    monitor = ReplicaMonitor(async_engine, max_lag=1.0, check_interval=60)
+
+    assert await monitor._replication_lag() == 0
+    assert await monitor.is_usable() is True
@@ -0,0 +1,46 @@
+import logging
+import os
+import queue
+import uuid
+
+import pytest
+
+from src.app.core import logger as logger_module
+from src.app.core.logger import LOG_RECORDS_DROPPED, DroppingQueueHandler
+
+
+def test_full_log_queue_drops_and_counts_records(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    handler = DroppingQueueHandler(queue.Queue(maxsize=1))
+    logger = logging.getLogger("tests.dropping")
+    monkeypatch.setattr(logger, "propagate", False)
+    logger.addHandler(handler)
+    dropped_before = LOG_RECORDS_DROPPED.value()
+
+    try:
+        logger.warning("first %s", "record")
+        logger.warning("second %s", "record")
+    finally:
+        logger.removeHandler(handler)
+
+    assert LOG_RECORDS_DROPPED.value() == dropped_before + 1
+    record = handler.queue.get_nowait()
+    assert record.args == ("record",)
+    assert record.getMessage() == "first record"
+
+
+def test_forked_child_gets_its_own_listener() -> None:
+    message = f"logged from child {uuid.uuid4().hex}"
+
+    pid = os.fork()
+    if pid == 0:  # pragma: no cover - child
+        try:
+            logging.getLogger("tests.fork").warning(message)
+            logger_module._stop_listener()  # flushes the queue
+        finally:
+            os._exit(0)
+
+    os.waitpid(pid, 0)
+    with open(logger_module.LOG_FILE_PATH) as log_file:
+        assert message in log_file.read()
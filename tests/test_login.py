@@ -0,0 +1,163 @@
+import asyncio
+
+import pytest
+from fastapi import status
+from httpx import AsyncClient
+from pytest_mock import MockerFixture
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.app.api.dependencies import user_cache
+from src.app.api.v1.login import login_username_limiter
+from src.app.core.admission import ADMISSIONS, AdmissionController
+from src.app.core.db.database import async_get_read_db
+from src.app.core.exceptions.http_exceptions import ServiceUnavailableException
+from src.app.core.security import revocation_cache
+from tests.conftest import fake, override_dependency
+
+from .helpers import generators
+
+pytestmark = pytest.mark.anyio
+
+
+async def login(client: AsyncClient, username: str, password: str) -> str:
+    response = await client.post(
+        "/api/v1/login", data={"username": username, "password": password}
+    )
+    assert response.status_code == status.HTTP_201_CREATED
+    return response.json()["access_token"]
+
+
+async def test_logout_revokes_access_token(
+    db: AsyncSession, client: AsyncClient
+) -> None:
+    password = fake.password()
+    user = await generators.create_user(db, password=password)
+    headers = {
+        "Authorization": f"Bearer {await login(client, user.username, password)}"
+    }
+
+    response = await client.get("/api/v1/user/me/", headers=headers)
+    assert response.status_code == status.HTTP_200_OK
+    assert response.json()["username"] == user.username
+
+    response = await client.post("/api/v1/logout", headers=headers)
+    assert response.status_code == status.HTTP_201_CREATED
+    assert revocation_cache.loaded
+
+    response = await client.get("/api/v1/user/me/", headers=headers)
+    assert response.status_code == status.HTTP_401_UNAUTHORIZED
+
+
+async def test_login_with_wrong_password(db: AsyncSession, client: AsyncClient) -> None:
+    user = await generators.create_user(db)
+
+    response = await client.post(
+        "/api/v1/login", data={"username": user.username, "password": "wrong"}
+    )
+    assert response.status_code == status.HTTP_401_UNAUTHORIZED
+
+
+async def test_user_cache_is_invalidated_on_update(
+    db: AsyncSession, client: AsyncClient
+) -> None:
+    password = fake.password()
+    user = await generators.create_user(db, password=password)
+    headers = {
+        "Authorization": f"Bearer {await login(client, user.username, password)}"
+    }
+
+    assert (await client.get("/api/v1/user/me/", headers=headers)).status_code == 200
+    assert user_cache.get(user.username) is not None
+
+    new_name = fake.name()[:30]
+    response = await client.patch(
+        f"/api/v1/user/{user.username}", json={"name": new_name}, headers=headers
+    )
+    assert response.status_code == status.HTTP_200_OK
+
+    response = await client.get("/api/v1/user/me/", headers=headers)
+    assert response.json()["name"] == new_name
+
+
+async def test_single_query_auth_path_without_revocation_cache(
+    db: AsyncSession,
+    client: AsyncClient,
+    monkeypatch: pytest.MonkeyPatch,
+    mocker: MockerFixture,
+) -> None:
+    async def skip_load(*args, **kwargs) -> None:
+        return None
+
+    monkeypatch.setattr(revocation_cache, "loaded", False)
+    monkeypatch.setattr(revocation_cache, "load", skip_load)
+    # The revocation check must not be answered by a (possibly lagging) replica.
+    replica = mocker.AsyncMock(spec=AsyncSession)
+    replica.execute.side_effect = AssertionError("revocation checked on the replica")
+    override_dependency(async_get_read_db, replica)
+
+    password = fake.password()
+    user = await generators.create_user(db, password=password)
+    headers = {
+        "Authorization": f"Bearer {await login(client, user.username, password)}"
+    }
+
+    response = await client.get("/api/v1/user/me/", headers=headers)
+    assert response.status_code == status.HTTP_200_OK
+
+    assert (await client.post("/api/v1/logout", headers=headers)).status_code == 201
+
+    response = await client.get("/api/v1/user/me/", headers=headers)
+    assert response.status_code == status.HTTP_401_UNAUTHORIZED
+
+
+async def test_login_rate_limited_per_username(client: AsyncClient) -> None:
+    username = fake.user_name()
+    for _ in range(login_username_limiter.burst):
+        response = await client.post(
+            "/api/v1/login", data={"username": username, "password": "wrong"}
+        )
+        assert response.status_code == status.HTTP_401_UNAUTHORIZED
+
+    response = await client.post(
+        "/api/v1/login", data={"username": username.upper(), "password": "wrong"}
+    )
+    assert response.status_code == status.HTTP_429_TOO_MANY_REQUESTS
+    assert int(response.headers["retry-after"]) >= 1
+
+
+async def test_login_shed_when_admission_queue_is_full(
+    client: AsyncClient, mocker: MockerFixture
+) -> None:
+    admission = AdmissionController(
+        "login", max_concurrency=1, queue_size=0, queue_timeout=1, retry_after=3
+    )
+    mocker.patch("src.app.api.v1.login.login_admission", admission)
+    shed_before = ADMISSIONS.value(controller="login", outcome="shed")
+
+    async with admission.admit():
+        response = await client.post(
+            "/api/v1/login", data={"username": fake.user_name(), "password": "x"}
+        )
+
+    assert response.status_code == status.HTTP_503_SERVICE_UNAVAILABLE
+    assert response.headers["retry-after"] == "3"
+    assert ADMISSIONS.value(controller="login", outcome="shed") == shed_before + 1
+
+
+async def test_admission_queue_waits_for_a_slot_until_deadline() -> None:
+    admission = AdmissionController(
+        "test", max_concurrency=1, queue_size=1, queue_timeout=0.05, retry_after=1
+    )
+
+    async with admission.admit():
+        with pytest.raises(ServiceUnavailableException):
+            async with admission.admit():
+                pass
+
+    async def hold_briefly() -> None:
+        async with admission.admit():
+            await asyncio.sleep(0.01)
+
+    await asyncio.gather(hold_briefly(), hold_briefly())
+    assert ADMISSIONS.value(controller="test", outcome="queued") == 2
+    assert ADMISSIONS.value(controller="test", outcome="admitted") == 3
@@ -0,0 +1,87 @@
+import pytest
+from fastapi import status
+from httpx import AsyncClient
+from sqlalchemy import text
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.app.core.instrumentation import (
+    REQUEST_DB_QUERIES,
+    REQUEST_LATENCY_SECONDS,
+    REQUEST_PASSWORD_SECONDS,
+    RequestStats,
+    _request_stats,
+)
+from src.app.core.metrics import Histogram, MetricsRegistry, registry
+from tests.conftest import fake
+
+from .helpers import generators
+from .test_login import login
+
+pytestmark = pytest.mark.anyio
+
+
+async def test_login_records_route_metrics(
+    db: AsyncSession, client: AsyncClient
+) -> None:
+    password = fake.password()
+    user = await generators.create_user(db, password=password)
+    labels = {"method": "POST", "route": "/api/v1/login"}
+    logins_before = REQUEST_LATENCY_SECONDS.count(status="201", **labels)
+    password_seconds_before = REQUEST_PASSWORD_SECONDS.sum(**labels)
+
+    await login(client, user.username, password)
+
+    assert REQUEST_LATENCY_SECONDS.count(status="201", **labels) == logins_before + 1
+    assert REQUEST_PASSWORD_SECONDS.sum(**labels) > password_seconds_before
+    assert REQUEST_DB_QUERIES.sum(**labels) >= 1
+
+
+async def test_metrics_endpoint_renders_prometheus_text(client: AsyncClient) -> None:
+    await client.get("/api/v1/user/does-not-exist-404")
+
+    response = await client.get("/metrics")
+    assert response.status_code == status.HTTP_200_OK
+    assert response.headers["content-type"].startswith("text/plain")
+    assert "# TYPE http_request_duration_seconds histogram" in response.text
+    assert 'route="/api/v1/user/{username}"' in response.text
+
+
+def test_histogram_renders_cumulative_buckets() -> None:
+    local_registry = MetricsRegistry()
+    histogram = Histogram(
+        "test_render_seconds",
+        "Render test.",
+        labelnames=("op",),
+        buckets=(1, 2),
+        registry=local_registry,
+    )
+    for value in (0.5, 1.5, 3):
+        histogram.observe(value, op='a"b')
+
+    text = local_registry.render()
+
+    assert registry.get("test_render_seconds") is None
+
+    assert "# TYPE test_render_seconds histogram" in text
+    assert 'test_render_seconds_bucket{op="a\\"b",le="1"} 1' in text
+    assert 'test_render_seconds_bucket{op="a\\"b",le="2"} 2' in text
+    assert 'test_render_seconds_bucket{op="a\\"b",le="+Inf"} 3' in text
+    assert 'test_render_seconds_sum{op="a\\"b"} 5' in text
+    assert 'test_render_seconds_count{op="a\\"b"} 3' in text
+
+
+async def test_failed_statements_leave_no_timing_state(db: AsyncSession) -> None:
+    stats = RequestStats()
+    token = _request_stats.set(stats)
+    try:
+        with pytest.raises(DBAPIError):
+            async with db.begin_nested():
+                await db.execute(text("SELECT * FROM no_such_table"))
+        await db.execute(text("SELECT 1"))
+    finally:
+        _request_stats.reset(token)
+
+    connection = await db.connection()
+    assert "query_started_at" not in connection.info
+    assert stats.db_queries >= 1
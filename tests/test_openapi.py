@@ -0,0 +1,27 @@
+from unittest.mock import patch
+
+import pytest
+from fastapi import status
+from httpx import AsyncClient
+
+pytestmark = pytest.mark.anyio
+
+
+async def test_openapi_schema_is_built_once_and_revalidated(
+    client: AsyncClient,
+) -> None:
+    response = await client.get("/openapi.json")
+    assert response.status_code == status.HTTP_200_OK
+    assert "/api/v1/login" in response.json()["paths"]
+    etag = response.headers["etag"]
+
+    with patch("src.app.core.setup.get_openapi") as get_openapi:
+        response = await client.get("/openapi.json")
+        assert response.status_code == status.HTTP_200_OK
+        assert response.headers["etag"] == etag
+
+        response = await client.get("/openapi.json", headers={"If-None-Match": etag})
+        assert response.status_code == status.HTTP_304_NOT_MODIFIED
+        assert response.content == b""
+
+    get_openapi.assert_not_called()
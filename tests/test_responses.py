@@ -0,0 +1,66 @@
+import uuid
+from datetime import UTC, datetime
+
+import pytest
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel
+
+from src.app.core import responses
+from src.app.core.responses import (
+    FastJSONResponse,
+    default_response_class,
+    trusted_response,
+)
+
+
+class Item(BaseModel):
+    id: uuid.UUID
+    name: str
+    created_at: datetime
+    deleted_at: datetime | None = None
+
+
+# orjson ships with the optional `fast-json` extra.
+requires_orjson = pytest.mark.skipif(
+    responses.orjson is None, reason="orjson is not installed"
+)
+
+
+@requires_orjson
+def test_fast_json_matches_stdlib_output() -> None:
+    item = Item(id=uuid.uuid4(), name="Zoë", created_at=datetime.now(UTC))
+    content = {"data": [item.model_dump(mode="json")], "has_more": False}
+
+    assert FastJSONResponse(content).body == JSONResponse(content).body
+
+
+@requires_orjson
+def test_fast_json_encodes_python_types_like_pydantic() -> None:
+    item = Item(id=uuid.uuid4(), name="Zoë", created_at=datetime.now(UTC))
+
+    assert FastJSONResponse(item.model_dump()).body == item.model_dump_json().encode()
+
+
+@requires_orjson
+def test_default_response_class_is_opt_in() -> None:
+    assert default_response_class(fast_json=False) is JSONResponse
+    assert default_response_class(fast_json=True) is FastJSONResponse
+
+
+def test_default_response_class_falls_back_without_orjson(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    monkeypatch.setattr(responses, "orjson", None)
+
+    assert default_response_class(fast_json=True) is JSONResponse
+
+
+@requires_orjson
+def test_trusted_response_uses_the_apps_response_class() -> None:
+    for app, expected in (
+        (FastAPI(), JSONResponse),
+        (FastAPI(default_response_class=FastJSONResponse), FastJSONResponse),
+    ):
+        request = Request({"type": "http", "app": app})
+        assert type(trusted_response(request, {"id": 1})) is expected
@@ -0,0 +1,100 @@
+import time
+from collections.abc import Iterator
+from datetime import timedelta
+from typing import Any
+
+import pytest
+from jose import jwt
+from pytest_mock import MockerFixture
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.app.core.db.database import async_engine, local_session
+from src.app.core.db.token_blacklist import TokenBlacklist
+from src.app.core.db.token_blacklist_sweeper import (
+    purge_expired_tokens,
+    sweep_token_blacklist,
+    sweeper_lock,
+)
+from src.app.core.password_pool import PASSWORD_POOL_OPERATIONS
+from src.app.core.security import (
+    ALGORITHM,
+    SECRET_KEY,
+    async_get_password_hash,
+    blacklist_token,
+    create_access_token,
+    revocation_cache,
+    token_digest,
+    verify_password,
+)
+from tests.conftest import fake
+
+pytestmark = pytest.mark.anyio
+
+
+@pytest.fixture
+def west_of_utc(monkeypatch: pytest.MonkeyPatch) -> Iterator[None]:
+    monkeypatch.setenv("TZ", "America/New_York")
+    time.tzset()
+    yield
+    monkeypatch.undo()
+    time.tzset()
+
+
+async def test_password_hashing_runs_on_worker_pool() -> None:
+    password = fake.password()
+    verified_before = PASSWORD_POOL_OPERATIONS.value(operation="check_password")
+
+    hashed_password = await async_get_password_hash(password)
+
+    assert await verify_password(password, hashed_password) is True
+    assert await verify_password(password + "x", hashed_password) is False
+    assert PASSWORD_POOL_OPERATIONS.value(operation="check_password") == (
+        verified_before + 2
+    )
+
+
+async def test_tokens_carry_unique_jti_and_compact_digest() -> None:
+    tokens = [await create_access_token(data={"sub": "userson"}) for _ in range(2)]
+    payloads = [jwt.decode(t, SECRET_KEY, algorithms=[ALGORITHM]) for t in tokens]
+
+    assert payloads[0]["jti"] != payloads[1]["jti"]
+    digests = {token_digest(t, p) for t, p in zip(tokens, payloads)}
+    assert len(digests) == 2
+    assert all(len(digest) == 16 for digest in digests)
+
+
+async def test_only_one_worker_sweeps_at_a_time(
+    application: Any, mocker: MockerFixture
+) -> None:
+    if async_engine.dialect.name != "postgresql":
+        pytest.skip("the sweeper lock is a PostgreSQL advisory lock")
+    sweep = mocker.patch("src.app.core.db.token_blacklist_sweeper._sweep")
+
+    async with sweeper_lock(local_session) as acquired:
+        assert acquired is True
+        assert await sweep_token_blacklist(local_session, batch_size=100) == 0
+        sweep.assert_not_called()
+
+    await sweep_token_blacklist(local_session, batch_size=100)
+    sweep.assert_called_once()
+
+
+async def test_revocation_outlives_sweep_west_of_utc(
+    db: AsyncSession, west_of_utc: None
+) -> None:
+    token = await create_access_token(
+        data={"sub": "userson"}, expires_delta=timedelta(hours=1)
+    )
+    payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
+    digest = token_digest(token, payload)
+
+    await blacklist_token(token, db)
+    await purge_expired_tokens(db, batch_size=100)
+    revocation_cache._prune()
+
+    stored = await db.scalar(
+        select(TokenBlacklist.id).where(TokenBlacklist.token_digest == digest)
+    )
+    assert stored is not None
+    assert digest in revocation_cache
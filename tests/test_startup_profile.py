@@ -0,0 +1,54 @@
+import asyncio
+
+import pytest
+from pytest_mock import MockerFixture
+
+from src.app.api import router
+from src.app.core.config import settings
+from src.app.core.setup import create_application
+from src.app.startup_profile import group_by_package, parse_importtime
+
+IMPORTTIME_OUTPUT = """\
+import time: self [us] | cumulative | imported package
+import time:       120 |        120 |     jose.exceptions
+import time:       300 |        420 |   jose
+import time:      1000 |       1000 |     src.app.core.config
+import time:       500 |       1500 |   src.app.core
+import time:       200 |       2120 | src.app.main
+"""
+
+
+def test_parse_importtime() -> None:
+    timings = parse_importtime(IMPORTTIME_OUTPUT)
+
+    assert [timing.module for timing in timings][-1] == "src.app.main"
+    assert timings[0].self_us == 120
+    assert timings[0].depth == 2
+    assert timings[-1].cumulative_us == 2120
+    assert timings[-1].depth == 0
+
+
+def test_group_by_package() -> None:
+    totals = group_by_package(parse_importtime(IMPORTTIME_OUTPUT), "src.app")
+
+    assert totals == {"src.app.core": 1500, "jose": 420, "src.app.main": 200}
+
+
+@pytest.mark.anyio
+@pytest.mark.parametrize("fast_boot", [True, False])
+async def test_fast_boot_skips_table_inspection(
+    mocker: MockerFixture, fast_boot: bool
+) -> None:
+    create_tables = mocker.patch("src.app.core.setup.create_tables_if_not_exist")
+    loaded = asyncio.Event()
+    mocker.patch(
+        "src.app.core.setup.load_revocation_cache",
+        side_effect=lambda: loaded.set(),
+    )
+    application = create_application(
+        router=router, settings=settings.model_copy(update={"FAST_BOOT": fast_boot})
+    )
+
+    async with application.router.lifespan_context(application):
+        assert create_tables.called is not fast_boot
+        await asyncio.wait_for(loaded.wait(), timeout=5)
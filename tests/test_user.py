@@ -1,17 +1,30 @@
+import asyncio
+import json
+import uuid
+from typing import Any
+
+import pytest
 from fastapi import status
-from fastapi.testclient import TestClient
+from httpx import ASGITransport, AsyncClient
 from pytest_mock import MockerFixture
-from sqlalchemy.orm import Session
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from src.app.api.dependencies import get_current_user
 from src.app.api.v1.users import oauth2_scheme
+from src.app.core.config import settings
+from src.app.core.pagination import cursor_paginated_response
+from src.app.crud.crud_users import taken_field
+from src.app.schemas.user import UserRead
 from tests.conftest import fake, override_dependency
 
 from .helpers import generators, mocks
 
+pytestmark = pytest.mark.anyio
+
 
-def test_post_user(client: TestClient) -> None:
-    response = client.post(
+async def test_post_user(client: AsyncClient) -> None:
+    response = await client.post(
         "/api/v1/user",
         json={
             "name": fake.name(),
@@ -23,65 +36,326 @@ def test_post_user(client: TestClient) -> None:
     assert response.status_code == status.HTTP_201_CREATED
 
 
-def test_get_user(db: Session, client: TestClient) -> None:
-    user = generators.create_user(db)
+async def test_post_user_with_taken_email_or_username(client: AsyncClient) -> None:
+    payload = {
+        "name": fake.name()[:30],
+        "username": fake.user_name(),
+        "email": fake.email(),
+        "password": fake.password(),
+    }
+    assert (await client.post("/api/v1/user", json=payload)).status_code == 201
+
+    response = await client.post(
+        "/api/v1/user", json={**payload, "username": payload["username"] + "x"}
+    )
+    assert response.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
+    assert response.json()["detail"] == "Email is already registered"
+
+    response = await client.post(
+        "/api/v1/user", json={**payload, "email": "x" + payload["email"]}
+    )
+    assert response.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
+    assert response.json()["detail"] == "Username not available"
+
+
+async def test_get_user(db: AsyncSession, client: AsyncClient) -> None:
+    user = await generators.create_user(db)
 
-    response = client.get(f"/api/v1/user/{user.username}")
+    response = await client.get(f"/api/v1/user/{user.username}")
     assert response.status_code == status.HTTP_200_OK
 
     response_data = response.json()
 
     assert response_data["id"] == user.id
     assert response_data["username"] == user.username
+    # Served without response_model validation, so the selected columns must
+    # be exactly the schema's.
+    assert set(response_data) == set(UserRead.model_fields)
 
 
-def test_get_multiple_users(db: Session, client: TestClient) -> None:
+async def test_get_multiple_users(db: AsyncSession, client: AsyncClient) -> None:
     for _ in range(5):
-        generators.create_user(db)
+        await generators.create_user(db)
 
-    response = client.get("/api/v1/users")
+    response = await client.get("/api/v1/users")
     assert response.status_code == status.HTTP_200_OK
 
     response_data = response.json()["data"]
-    assert len(response_data) >= 5
+    assert len(response_data) == 5
 
 
-def test_update_user(db: Session, client: TestClient) -> None:
-    user = generators.create_user(db)
+async def test_update_user(db: AsyncSession, client: AsyncClient) -> None:
+    user = await generators.create_user(db)
     new_name = fake.name()
 
     override_dependency(get_current_user, mocks.get_current_user(user))
 
-    response = client.patch(f"/api/v1/user/{user.username}", json={"name": new_name})
+    response = await client.patch(
+        f"/api/v1/user/{user.username}", json={"name": new_name}
+    )
     assert response.status_code == status.HTTP_200_OK
+    assert response.json()["name"] == new_name
+    assert response.json()["username"] == user.username
+
+
+async def test_update_user_with_taken_email(
+    db: AsyncSession, client: AsyncClient
+) -> None:
+    user = await generators.create_user(db)
+    other_user = await generators.create_user(db)
+
+    override_dependency(get_current_user, mocks.get_current_user(user))
+
+    response = await client.patch(
+        f"/api/v1/user/{user.username}", json={"email": other_user.email}
+    )
+    assert response.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
+    assert response.json()["detail"] == "Email is already registered"
+
+    response = await client.patch(
+        f"/api/v1/user/{other_user.username}", json={"name": fake.name()[:30]}
+    )
+    assert response.status_code == status.HTTP_403_FORBIDDEN
+
+
+async def test_update_user_with_taken_email_naming_a_field(
+    db: AsyncSession, client: AsyncClient
+) -> None:
+    user = await generators.create_user(db)
+    other_user = await generators.create_user(db)
+    other_user.email = f"username{uuid.uuid4().hex[:8]}@example.com"
+    await db.commit()
+
+    override_dependency(get_current_user, mocks.get_current_user(user))
+
+    response = await client.patch(
+        f"/api/v1/user/{user.username}", json={"email": other_user.email}
+    )
+    assert response.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
+    assert response.json()["detail"] == "Email is already registered"
+
+
+def test_taken_field_ignores_other_integrity_errors() -> None:
+    error = IntegrityError(
+        "INSERT", {}, Exception("NOT NULL constraint failed: user.username")
+    )
+    assert taken_field(error) is None
 
 
-def test_delete_user(db: Session, client: TestClient, mocker: MockerFixture) -> None:
-    user = generators.create_user(db)
+async def test_delete_user(
+    db: AsyncSession, client: AsyncClient, mocker: MockerFixture
+) -> None:
+    user = await generators.create_user(db)
 
     override_dependency(get_current_user, mocks.get_current_user(user))
     override_dependency(oauth2_scheme, mocks.oauth2_scheme())
 
     mocker.patch(
-        "src.app.core.security.jwt.decode",
+        "jose.jwt.decode",
         return_value={"sub": user.username, "exp": 9999999999},
     )
 
-    response = client.delete(f"/api/v1/user/{user.username}")
+    response = await client.delete(f"/api/v1/user/{user.username}")
     assert response.status_code == status.HTTP_200_OK
 
 
-def test_delete_db_user(db: Session, mocker: MockerFixture, client: TestClient) -> None:
-    user = generators.create_user(db)
-    super_user = generators.create_user(db, is_super_user=True)
+async def test_delete_db_user(
+    db: AsyncSession, mocker: MockerFixture, client: AsyncClient
+) -> None:
+    user = await generators.create_user(db)
+    super_user = await generators.create_user(db, is_super_user=True)
 
     override_dependency(get_current_user, mocks.get_current_user(super_user))
     override_dependency(oauth2_scheme, mocks.oauth2_scheme())
 
     mocker.patch(
-        "src.app.core.security.jwt.decode",
+        "jose.jwt.decode",
         return_value={"sub": user.username, "exp": 9999999999},
     )
 
-    response = client.delete(f"/api/v1/db_user/{user.username}")
+    response = await client.delete(f"/api/v1/db_user/{user.username}")
+    assert response.status_code == status.HTTP_200_OK
+
+
+async def test_get_users_by_cursor(db: AsyncSession, client: AsyncClient) -> None:
+    for _ in range(3):
+        await generators.create_user(db)
+
+    response = await client.get("/api/v1/users", params={"items_per_page": 2})
+    assert response.status_code == status.HTTP_200_OK
+    first_page = response.json()
+    assert first_page["has_more"] is True
+    assert first_page["total_count"] == 3
+
+    response = await client.get(
+        "/api/v1/users",
+        params={"items_per_page": 2, "after": first_page["next_cursor"]},
+    )
+    assert response.status_code == status.HTTP_200_OK
+    second_page = response.json()
+    assert second_page["total_count"] is None
+    assert second_page["page"] is None
+    assert second_page["data"][0]["id"] > first_page["data"][-1]["id"]
+
+
+async def test_get_users_rejects_invalid_page_size(
+    db: AsyncSession, client: AsyncClient
+) -> None:
+    await generators.create_user(db)
+
+    for params in ({"items_per_page": 0}, {"items_per_page": 101}, {"page": 0}):
+        response = await client.get("/api/v1/users", params=params)
+        assert response.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
+
+
+def test_cursor_paginated_response_with_no_rows_per_page() -> None:
+    response = cursor_paginated_response({"data": [{"id": 1}]}, items_per_page=0)
+    assert response["data"] == []
+    assert response["next_cursor"] is None
+
+
+async def test_get_users_with_invalid_cursor(client: AsyncClient) -> None:
+    response = await client.get("/api/v1/users", params={"after": "not-a-cursor"})
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+
+async def test_get_users_with_cached_count(
+    db: AsyncSession, client: AsyncClient
+) -> None:
+    await generators.create_user(db)
+
+    response = await client.get("/api/v1/users", params={"count": "exact"})
+    assert response.status_code == status.HTTP_200_OK
+    exact_page = response.json()
+    assert exact_page["total_count_exact"] is True
+
+    response = await client.get("/api/v1/users", params={"count": "cached"})
+    assert response.status_code == status.HTTP_200_OK
+    cached_page = response.json()
+    assert cached_page["total_count_exact"] is False
+    assert cached_page["total_count"] == exact_page["total_count"]
+
+
+async def test_get_users_with_estimated_count(
+    db: AsyncSession, client: AsyncClient
+) -> None:
+    # The `user` table also exists in other schemas (public, other workers'),
+    # so the estimate must pick the one on the search_path.
+    await generators.create_user(db)
+
+    response = await client.get("/api/v1/users", params={"count": "estimated"})
+    assert response.status_code == status.HTTP_200_OK
+    assert response.json()["total_count"] is not None
+
+
+async def test_import_users(db: AsyncSession, client: AsyncClient) -> None:
+    super_user = await generators.create_user(db, is_super_user=True)
+    override_dependency(get_current_user, mocks.get_current_user(super_user))
+
+    rows = [
+        {
+            "name": fake.name()[:30],
+            "username": f"import{uuid.uuid4().hex[:12]}",
+            "email": f"{uuid.uuid4().hex}@example.com",
+            "password": fake.password(),
+        }
+        for _ in range(2)
+    ]
+    duplicate = {**rows[0], "email": f"{uuid.uuid4().hex}@example.com"}
+    lines = [json.dumps(row) for row in rows] + ["{not json", json.dumps(duplicate)]
+    lines.append(json.dumps({"name": "x", "username": "no"}))
+    lines.append(json.dumps({**rows[0], "email": "not-an-email"}))
+
+    response = await client.post(
+        "/api/v1/users/import",
+        files={"file": ("users.ndjson", "\n".join(lines), "application/x-ndjson")},
+    )
+    assert response.status_code == status.HTTP_201_CREATED
+    report = response.json()
+    assert report["imported"] == 2
+    assert report["failed"] == 4
+    assert [error["row"] for error in report["errors"]] == [3, 4, 5, 6]
+    assert report["errors"][1]["detail"] == "Email or username repeats an earlier row"
+    assert "email:" in report["errors"][3]["detail"]
+    # Validation errors name the fields, never the submitted values.
+    assert rows[0]["password"] not in response.text
+
+    response = await client.get(f"/api/v1/user/{rows[1]['username']}")
+    assert response.status_code == status.HTTP_200_OK
+
+
+async def test_concurrent_requests_on_app_sessions(application: Any) -> None:
+    # No session override: every request checks a connection out of the app's
+    # own pool, which for in-memory SQLite holds a single shared connection.
+    transport = ASGITransport(app=application)
+    async with AsyncClient(transport=transport, base_url="http://testserver") as c:
+        responses = await asyncio.gather(
+            *(c.get("/api/v1/users", params={"count": "exact"}) for _ in range(10))
+        )
+    assert [r.status_code for r in responses] == [status.HTTP_200_OK] * 10
+
+
+async def test_import_users_csv_reports_extra_fields(
+    db: AsyncSession, client: AsyncClient
+) -> None:
+    super_user = await generators.create_user(db, is_super_user=True)
+    override_dependency(get_current_user, mocks.get_current_user(super_user))
+
+    username = f"csv{uuid.uuid4().hex[:12]}"
+    lines = [
+        "name,username,email,password",
+        f"CSV User,{username},{uuid.uuid4().hex}@example.com,{fake.password()}",
+        f"Extra,extra{uuid.uuid4().hex[:12]},{uuid.uuid4().hex}@example.com,pw,surplus",
+    ]
+
+    response = await client.post(
+        "/api/v1/users/import",
+        files={"file": ("users.csv", "\n".join(lines), "text/csv")},
+    )
+    assert response.status_code == status.HTTP_201_CREATED
+    report = response.json()
+    assert report["imported"] == 1
+    assert report["errors"] == [
+        {"row": 2, "detail": "Row has more fields than the header"}
+    ]
+
+    response = await client.get(f"/api/v1/user/{username}")
     assert response.status_code == status.HTTP_200_OK
+
+
+async def test_import_users_bounds_password_hashing(
+    db: AsyncSession, client: AsyncClient, mocker: MockerFixture
+) -> None:
+    super_user = await generators.create_user(db, is_super_user=True)
+    override_dependency(get_current_user, mocks.get_current_user(super_user))
+
+    running, peak = 0, 0
+
+    async def slow_hash(password: str) -> str:
+        nonlocal running, peak
+        running += 1
+        peak = max(peak, running)
+        await asyncio.sleep(0.01)
+        running -= 1
+        return "hashed"
+
+    mocker.patch("src.app.api.v1.users.async_get_password_hash", slow_hash)
+    lines = [
+        json.dumps(
+            {
+                "name": fake.name()[:30],
+                "username": f"bound{uuid.uuid4().hex[:12]}",
+                "email": f"{uuid.uuid4().hex}@example.com",
+                "password": fake.password(),
+            }
+        )
+        for _ in range(6)
+    ]
+
+    response = await client.post(
+        "/api/v1/users/import",
+        files={"file": ("users.ndjson", "\n".join(lines), "application/x-ndjson")},
+    )
+    assert response.status_code == status.HTTP_201_CREATED
+    assert response.json()["imported"] == 6
+    assert peak == settings.USER_IMPORT_HASH_CONCURRENCY